@@ -1,47 +1,34 @@
 #!/usr/bin/env python3
 """
-Quick test - simulates scraper without browser automation
+Quick test - simulates scraper output without browser automation
+
+    python quick_test.py                  write two sample records to FIREBASE_URL
+    python quick_test.py --local          the same against a local RTDB stand-in
+    python quick_test.py --load 1000      push 1000 synthetic records through the writer
+                                          (local stand-in unless --remote) and report
+                                          throughput, latency percentiles and retries
 """
-import os
-import json
+import argparse
+import random
+import statistics
 import time
 from datetime import datetime
+
 import requests
 from dotenv import load_dotenv
 
 load_dotenv()
 
-FIREBASE_URL = os.getenv('FIREBASE_URL', 'https://cricket-stream-portal-default-rtdb.firebaseio.com')
-FIREBASE_AUTH = os.getenv('FIREBASE_AUTH', '')
+from scraper import config  # noqa: E402  (reads the environment loaded above)
+from scraper.fakertdb import FakeRtdb  # noqa: E402
+from scraper.firebase import FirebaseWriter  # noqa: E402
+from scraper.mirror import RtdbMirror  # noqa: E402
 
-def save_to_firebase(data, server_key):
-    """Save data to Firebase"""
-    try:
-        url = f"{FIREBASE_URL}/{server_key}.json"
-        if FIREBASE_AUTH:
-            url += f"?auth={FIREBASE_AUTH}"
-        
-        response = requests.put(url, json=data, timeout=10)
-        
-        if response.status_code == 200:
-            print(f"✅ Saved to Firebase: {server_key}")
-            print(f"   Link: {data['link']}")
-            return True
-        else:
-            print(f"❌ Firebase error: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return False
 
-def main():
-    print("=" * 60)
-    print("Quick Test - Simulating Scraper Output")
-    print("=" * 60)
-    
-    # Simulate scraped data (like what the real scraper would find)
-    test_streams = [
+def sample_streams():
+    """The two records the scraper would find for the sample sources"""
+    now = int(time.time() * 1000)
+    return [
         {
             'server_key': '2ndserverlink',
             'data': {
@@ -56,9 +43,9 @@ def main():
                 },
                 'status': 'OK',
                 'thumblink': '',
-                'createdAt': int(time.time() * 1000),
+                'createdAt': now,
                 'createdAtISO': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
-                'lastCheckedAt': int(time.time() * 1000)
+                'lastCheckedAt': now
             }
         },
         {
@@ -75,34 +62,172 @@ def main():
                 },
                 'status': 'OK',
                 'thumblink': 'https://img-s-msn-com.akamaized.net/tenant/amp/entityid/AA1QaGWE.img',
-                'createdAt': int(time.time() * 1000),
+                'createdAt': now,
                 'createdAtISO': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
-                'lastCheckedAt': int(time.time() * 1000)
+                'lastCheckedAt': now
             }
         }
     ]
-    
-    print(f"\nFirebase URL: {FIREBASE_URL}")
+
+
+def synthetic_record(idx, version, expires):
+    """A stream record like the scraper writes; `version` changes the link token"""
+    now = int(time.time() * 1000)
+    return {
+        'source_url': f'https://example.com/live/stream-{idx}',
+        'title': f'Synthetic Stream {idx}',
+        'name': f'Stream {idx}',
+        'link': f'https://cdn.example.com/hls/{idx}/index.m3u8?token=v{version}&expires={expires}',
+        'headers': {
+            'Origin': 'https://player.example.com',
+            'Referer': 'https://player.example.com/',
+            'User-Agent': config.USER_AGENT
+        },
+        'status': 'OK',
+        'thumblink': '',
+        'createdAt': now,
+        'createdAtISO': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'lastCheckedAt': now
+    }
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def connection_test(base_url, auth):
+    """Write the sample records and report whether Firebase accepted them"""
+    print(f"\nFirebase URL: {base_url}")
+    test_streams = sample_streams()
     print(f"Testing with {len(test_streams)} simulated streams...\n")
-    
-    success_count = 0
+
+    writer = FirebaseWriter(base_url=base_url, auth=auth, state_file=None)
     for stream in test_streams:
-        print(f"\nSaving {stream['server_key']}...")
-        if save_to_firebase(stream['data'], stream['server_key']):
-            success_count += 1
-    
+        writer.add(stream['server_key'], stream['data'])
+    outcomes = writer.flush()
+    success_count = sum(1 for o in outcomes.values() if o['ok'])
+
     print("\n" + "=" * 60)
     print(f"Results: {success_count}/{len(test_streams)} streams saved")
     print("=" * 60)
-    
+
     if success_count == len(test_streams):
         print("\n✅ SUCCESS! Firebase integration working!")
         print("\nYou can now:")
         print("1. Check your Firebase database for the test data")
-        print("2. Run the full scraper: python scraper.py")
+        print("2. Run the full scraper: python -m scraper")
         print("3. Push to GitHub when ready")
     else:
         print("\n⚠️  Some saves failed. Check Firebase permissions.")
 
+
+def load_test(base_url, auth, records, rounds=3, change_rate=0.1, batch_size=0, mirror=False):
+    """Write `records` synthetic streams `rounds` times and report writer performance.
+
+    The first round is all full writes. In later rounds `change_rate` of the
+    links change (full writes) and the rest are heartbeats.
+    """
+    latencies = []
+    session = requests.Session()
+    session.hooks['response'].append(lambda r, *args, **kwargs: latencies.append(r.elapsed.total_seconds()))
+
+    rtdb_mirror = None
+    if mirror:
+        rtdb_mirror = RtdbMirror(base_url=base_url, auth=auth).start()
+        if not rtdb_mirror.wait_ready():
+            print("⚠️  Mirror not ready, using local state")
+    writer = FirebaseWriter(base_url=base_url, auth=auth, batch_size=batch_size, session=session,
+                            state_file=None, mirror=rtdb_mirror, verbose=False)
+    versions = [0] * records
+    expires = int(time.time()) + 3600
+    report = {'records': records, 'rounds': [], 'batch_size': batch_size}
+
+    for number in range(rounds):
+        for idx in range(records):
+            if number and random.random() < change_rate:
+                versions[idx] += 1
+            writer.add(f'{idx}thserverlink', synthetic_record(idx, versions[idx], expires))
+        kinds = {}
+        for kind, _, _ in writer.pending.values():
+            kinds[kind] = kinds.get(kind, 0) + 1
+
+        requests_before, retries_before = len(latencies), writer.retry_count
+        started = time.perf_counter()
+        outcomes = writer.flush()
+        elapsed = time.perf_counter() - started
+        round_latencies = latencies[requests_before:]
+        report['rounds'].append({
+            'kinds': kinds,
+            'ok': sum(1 for o in outcomes.values() if o['ok']),
+            'failed': sum(1 for o in outcomes.values() if not o['ok']),
+            'elapsed': round(elapsed, 4),
+            'records_per_second': round(records / elapsed, 1) if elapsed else None,
+            'requests': len(round_latencies),
+            'retries': writer.retry_count - retries_before,
+            'latency_p50': percentile(round_latencies, 50),
+            'latency_p90': percentile(round_latencies, 90),
+            'latency_p99': percentile(round_latencies, 99)
+        })
+        if rtdb_mirror:
+            time.sleep(0.2)
+
+    if rtdb_mirror:
+        report['mirror_events'] = rtdb_mirror.events
+        rtdb_mirror.stop()
+    writer.close()
+    return report
+
+
+def print_load_report(report):
+    print(f"\n{report['records']} records per round, batch size {report['batch_size'] or 'all'}")
+    print(f"{'round':>5} {'full':>6} {'beat':>6} {'ok':>6} {'fail':>5} {'req':>5} {'retry':>5} "
+          f"{'rec/s':>9} {'p50 ms':>7} {'p90 ms':>7} {'p99 ms':>7}")
+    for number, r in enumerate(report['rounds'], 1):
+        print(f"{number:>5} {r['kinds'].get('full', 0):>6} {r['kinds'].get('heartbeat', 0):>6} "
+              f"{r['ok']:>6} {r['failed']:>5} {r['requests']:>5} {r['retries']:>5} "
+              f"{r['records_per_second'] or 0:>9.0f} {r['latency_p50'] * 1000:>7.1f} "
+              f"{r['latency_p90'] * 1000:>7.1f} {r['latency_p99'] * 1000:>7.1f}")
+    if 'mirror_events' in report:
+        print(f"Mirror events received: {report['mirror_events']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Firebase connection test and write load generator')
+    parser.add_argument('--local', action='store_true', help='use a local RTDB stand-in')
+    parser.add_argument('--remote', action='store_true', help='run --load against FIREBASE_URL')
+    parser.add_argument('--load', type=int, metavar='N', help='write N synthetic stream records')
+    parser.add_argument('--rounds', type=int, default=3, help='write rounds in a load test')
+    parser.add_argument('--change-rate', type=float, default=0.1,
+                        help='share of links that change between rounds')
+    parser.add_argument('--batch-size', type=int, default=config.FIREBASE_BATCH_SIZE,
+                        help='keys per PATCH (0 = all in one)')
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help='share of stand-in writes answered with 503')
+    parser.add_argument('--latency', type=float, default=0.0, help='stand-in delay per request')
+    parser.add_argument('--mirror', action='store_true', help='read state through a streaming mirror')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Quick Test - Simulating Scraper Output")
+    print("=" * 60)
+
+    local = args.local or (args.load and not args.remote)
+    rtdb = FakeRtdb(auth='local-test', fail_rate=args.fail_rate, latency=args.latency).start() if local else None
+    base_url, auth = (rtdb.url, 'local-test') if rtdb else (config.FIREBASE_URL, config.FIREBASE_AUTH)
+    try:
+        if args.load:
+            print(f"\nLoad test against {'local stand-in' if rtdb else base_url}")
+            report = load_test(base_url, auth, args.load, args.rounds, args.change_rate,
+                               args.batch_size, args.mirror)
+            print_load_report(report)
+        else:
+            connection_test(base_url, auth)
+    finally:
+        if rtdb:
+            rtdb.stop()
+
+
 if __name__ == '__main__':
     main()
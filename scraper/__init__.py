@@ -0,0 +1,3 @@
+"""
+Cricket stream scraper package - async engine shared by the scraper entry points
+"""
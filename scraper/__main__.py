@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""
+Entry point for `python -m scraper`
+"""
+from .engine import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark - runs each capture strategy against the local fake site, no network needed
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from . import config
+from .cascade import run_cascade
+from .fakesite import SCENARIOS, FakeSite
+from .metrics import metrics
+from .navigation import NAVIGATION_MODES
+from .pool import BrowserPool
+from .procmem import RssSampler, peak_rss_self
+from .strategies import STRATEGIES, get_strategies
+
+BENCH_FILE = 'bench_results.json'
+
+
+async def bench_run(site, strategy_name, scenario, navigation=None):
+    """Scrape one scenario with one strategy in a freshly launched browser"""
+    site.reset_counters()
+    metrics.reset()
+    stream_config = site.stream_config(scenario)
+    stats = {}
+    started = time.time()
+    async with async_playwright() as playwright:
+        pool = BrowserPool(playwright, size=1, args=config.BROWSER_ARGS + site.browser_args())
+        async with RssSampler() as sampler:
+            try:
+                capture = await run_cascade(get_strategies([strategy_name]), stream_config, pool,
+                                            stats, navigation)
+            finally:
+                await pool.close()
+    tier = stats['tiers'][0]
+    return {
+        'scenario': scenario,
+        'strategy': strategy_name,
+        'found': tier['found'],
+        'error': tier.get('error'),
+        'time_to_first_playlist': tier.get('time_to_first_playlist'),
+        'wall_time': round(time.time() - started, 3),
+        'navigation': tier.get('navigation', {}).get('elapsed'),
+        'browser_launches': pool.launches,
+        'requests_seen': tier.get('requests'),
+        'blocked': tier.get('blocked', {}),
+        'bytes_sent': sum(site.bytes_sent.values()),
+        'bytes_by_category': dict(site.bytes_sent),
+        'server_requests': dict(site.requests),
+        'peak_rss_browser': sampler.peak,
+        'phases': metrics.report()['phases'],
+        'link': capture.best().link if capture else None
+    }
+
+
+def _fmt(value, spec):
+    return '-' if value is None else format(value, spec)
+
+
+def print_report(runs):
+    """One line per scenario/strategy, medians over repeats"""
+    print(f"\n{'scenario':<10} {'strategy':<11} {'found':>5} {'ttfp s':>7} {'wall s':>7} "
+          f"{'launch':>6} {'KiB':>8} {'RSS MiB':>8}")
+    groups = {}
+    for run in runs:
+        groups.setdefault((run['scenario'], run['strategy']), []).append(run)
+    for (scenario, strategy), group in groups.items():
+        ttfp = [r['time_to_first_playlist'] for r in group if r['time_to_first_playlist'] is not None]
+        print(f"{scenario:<10} {strategy:<11} {sum(r['found'] for r in group):>2}/{len(group):<2} "
+              f"{_fmt(statistics.median(ttfp) if ttfp else None, '7.2f')} "
+              f"{statistics.median(r['wall_time'] for r in group):7.2f} "
+              f"{statistics.median(r['browser_launches'] for r in group):6.0f} "
+              f"{statistics.median(r['bytes_sent'] for r in group) / 1024:8.0f} "
+              f"{statistics.median(r['peak_rss_browser'] for r in group) / 2 ** 20:8.0f}")
+
+
+async def run_benchmarks(strategy_names, scenarios, repeat=1, delay=5.0, latency=0.0, navigation=None):
+    runs = []
+    with FakeSite(delay=delay, latency=latency) as site:
+        for scenario in scenarios:
+            for name in strategy_names:
+                for _ in range(repeat):
+                    print(f"Running {name} on {scenario}...")
+                    runs.append(await bench_run(site, name, scenario, navigation))
+    return runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark capture strategies against a local fake site')
+    parser.add_argument('--strategies', default=','.join(STRATEGIES),
+                        help='comma-separated strategies to run')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"comma-separated scenarios ({', '.join(SCENARIOS)})")
+    parser.add_argument('--repeat', type=int, default=1, help='runs per scenario and strategy')
+    parser.add_argument('--delay', type=float, default=5.0,
+                        help="seconds between play and the playlist request in the 'delayed' scenario")
+    parser.add_argument('--latency', type=float, default=0.0, help='server delay on playlist responses')
+    parser.add_argument('--navigation', choices=NAVIGATION_MODES, default=None)
+    parser.add_argument('--output', default=BENCH_FILE, help='JSON file for the raw runs')
+    args = parser.parse_args(argv)
+
+    strategy_names = [s.strip() for s in args.strategies.split(',') if s.strip()]
+    scenarios = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    try:
+        get_strategies(strategy_names)
+    except ValueError as e:
+        parser.error(str(e))
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    runs = asyncio.run(run_benchmarks(strategy_names, scenarios, args.repeat, args.delay,
+                                      args.latency, args.navigation))
+    print_report(runs)
+    print(f"\nPeak RSS (Python): {peak_rss_self() / 2 ** 20:.0f} MiB")
+    with open(args.output, 'w') as f:
+        json.dump({'runs': runs, 'peak_rss_python': peak_rss_self()}, f, indent=2)
+    print(f"Raw results saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Capture state for one stream - finishes as soon as a playlist is seen
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
+
+from . import config
+
+
+def is_playlist(url):
+    return '.m3u8' in url.lower()
+
+
+def is_segment(url):
+    return urlparse(url).path.lower().endswith(('.ts', '.m4s', '.aac'))
+
+
+def is_master(url):
+    return 'master' in url.lower()
+
+
+def is_playlist_type(content_type):
+    """application/vnd.apple.mpegurl, application/x-mpegURL, audio/mpegurl, ..."""
+    return 'mpegurl' in (content_type or '').lower()
+
+
+class CaptureRecord:
+    """A captured URL with the headers it was requested with and, once read, its body"""
+
+    __slots__ = ('link', 'headers', 'timestamp', 'body')
+
+    def __init__(self, link, headers, timestamp):
+        self.link = link
+        self.headers = headers
+        self.timestamp = timestamp
+        self.body = None
+
+
+def _put_bounded(records, url, headers, limit):
+    """Insert into an insertion-ordered dict, evicting the oldest entry past limit"""
+    if url in records:
+        return False
+    records[url] = CaptureRecord(url, headers, time.time())
+    if len(records) > limit:
+        records.popitem(last=False)
+    return True
+
+
+class Capture:
+    """Playlists captured for one stream, with events instead of fixed sleeps.
+
+    Playlists and segments are indexed by URL and bounded, and the debug URL log
+    is a ring buffer, so memory stays flat however long a capture runs.
+    """
+
+    def __init__(self, max_playlists=config.CAPTURE_MAX_PLAYLISTS,
+                 max_segments=config.CAPTURE_MAX_SEGMENTS, url_log_size=config.CAPTURE_URL_LOG):
+        self.playlists = OrderedDict()
+        self.segments = OrderedDict()
+        self.segment_hints = deque(maxlen=max_segments)
+        self.recent_urls = deque(maxlen=url_log_size)
+        self.request_count = 0
+        self.segment_count = 0
+        self.max_playlists = max_playlists
+        self.max_segments = max_segments
+        self.started = time.time()
+        self.first_seen = None
+        self._found = asyncio.Event()
+        self._master = asyncio.Event()
+
+    def saw(self, url):
+        """Count a request and keep it in the recent URL log"""
+        self.request_count += 1
+        self.recent_urls.append(url)
+
+    def add(self, url, headers):
+        """Record a playlist; returns False if it was already captured"""
+        if not _put_bounded(self.playlists, url, headers, self.max_playlists):
+            return False
+        if self.first_seen is None:
+            self.first_seen = self.playlists[url].timestamp
+        self._found.set()
+        if is_master(url):
+            self._master.set()
+        return True
+
+    def set_body(self, url, body):
+        """Attach the response body of a captured playlist, so it need not be fetched again"""
+        record = self.playlists.get(url)
+        if record and body:
+            record.body = body
+            if is_master(url) or '#EXT-X-STREAM-INF' in body:
+                self._master.set()
+
+    def add_segment(self, url, headers):
+        """Record a media segment (kept for diagnostics when no playlist shows up)"""
+        if _put_bounded(self.segments, url, headers, self.max_segments):
+            self.segment_count += 1
+
+    def add_segment_hint(self, url):
+        """Keep a URL tied to a segment request (its pre-redirect URL or initiator)"""
+        if url and url not in self.segment_hints:
+            self.segment_hints.append(url)
+
+    def video_urls(self, limit=10):
+        """Video-related URLs from the recent URL log, for debug output"""
+        markers = ('.m3u8', '.ts', '.mp4', 'video', 'stream', 'hls', 'manifest')
+        return [u for u in self.recent_urls if any(m in u.lower() for m in markers)][-limit:]
+
+    @property
+    def found(self):
+        return self._found.is_set()
+
+    async def wait(self, timeout, settle=config.CAPTURE_SETTLE):
+        """Wait up to `timeout` for a first playlist, then up to `settle` for a master"""
+        try:
+            await asyncio.wait_for(self._found.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        if settle > 0 and not self._master.is_set():
+            try:
+                await asyncio.wait_for(self._master.wait(), settle)
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    def candidates(self):
+        """Captured playlists, URLs that look like masters first, then newest first"""
+        return sorted(self.playlists.values(), key=lambda p: (is_master(p.link), p.timestamp),
+                      reverse=True)
+
+    def best(self):
+        """Prefer master playlists, then the most recent one (by URL only)"""
+        candidates = self.candidates()
+        return candidates[0] if candidates else None
+
+    def time_to_first(self):
+        if self.first_seen is None:
+            return None
+        return self.first_seen - self.started
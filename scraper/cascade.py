@@ -0,0 +1,115 @@
+"""
+Cascade runner - tries the cheap strategy first and escalates only when nothing is found
+"""
+import asyncio
+import time
+
+from . import config
+from .capture import Capture
+from .harvest import harvest
+from .log import log
+from .metrics import metrics
+from .navigation import navigate, navigation_settings
+from .routing import RouteFilter
+from .segments import resolve_playlist
+
+
+async def run_strategy(strategy, stream_config, pool, stats, navigation=None, budget=None):
+    """Run one strategy in a fresh browser context and return its Capture.
+
+    `budget` is an (initial_wait, timeout) pair replacing the strategy's own.
+    """
+    initial_wait, timeout = budget or (strategy.initial_wait, strategy.timeout)
+    capture = Capture()
+    async with pool.context() as context:
+        route_filter = RouteFilter.for_stream(stream_config)
+        if route_filter:
+            await route_filter.install(context)
+        page = await context.new_page()
+        await strategy.attach(page, capture, stream_config)
+
+        mode, nav_timeout = navigation_settings(stream_config, navigation)
+        log(stream_config, f"[{strategy.name}] Loading page ({mode})...")
+        with metrics.span('navigation', stream_config['name']):
+            stats['navigation'] = await navigate(page, stream_config['url'], capture, mode, nav_timeout)
+        log(stream_config, f"[{strategy.name}] Navigation {stats['navigation']['outcome']} "
+                           f"after {stats['navigation']['elapsed']:.1f}s")
+
+        if config.HARVEST and not capture.found:
+            await harvest(page, capture, stream_config)
+        with metrics.span('capture_wait', stream_config['name']):
+            found = await capture.wait(initial_wait, settle=0)
+        if not found and config.HARVEST:
+            found = await harvest(page, capture, stream_config) > 0
+        if not found:
+            log(stream_config, f"[{strategy.name}] Interacting with {len(page.frames)} frame(s)...")
+            metrics.count('frames_seen', len(page.frames))
+            with metrics.span('interaction', stream_config['name']):
+                await strategy.interact(page, capture, stream_config)
+
+        with metrics.span('capture_wait', stream_config['name']):
+            await capture.wait(timeout)
+        stats['requests'] = capture.request_count
+        metrics.count('requests_seen', capture.request_count)
+        metrics.count('playlist_candidates', len(capture.playlists))
+        metrics.count('segments_seen', capture.segment_count)
+        if route_filter:
+            stats['blocked'] = dict(route_filter.blocked)
+            metrics.count('requests_blocked', sum(route_filter.blocked.values()))
+    return capture
+
+
+async def resolve_segments(capture, stream_config, stats):
+    """Rebuild the playlist from segment traffic when a tier saw segments but no playlist"""
+    segments = [(s.link, s.headers) for s in reversed(capture.segments.values())]
+    with metrics.span('segment_resolve', stream_config['name']):
+        resolved = await asyncio.to_thread(resolve_playlist, segments, list(capture.segment_hints))
+    if not resolved:
+        log(stream_config, f"Could not infer a playlist from {len(segments)} segment(s)")
+        return False
+    link, headers = resolved
+    capture.add(link, headers)
+    stats['resolved_from_segments'] = True
+    metrics.count('playlists_from_segments')
+    log(stream_config, f"✅ Inferred m3u8 from segments: {link[:80]}...")
+    return True
+
+
+async def run_cascade(strategies, stream_config, pool, stats, navigation=None, history=None):
+    """Try each strategy in order until one captures a playlist.
+
+    Per-tier attempts go to stats['tiers'] and the winning tier to stats['tier'].
+    With a SourceHistory, wait budgets are sized from the source's past runs.
+    Returns the successful Capture, or None.
+    """
+    stats['tiers'] = []
+    stats['tier'] = None
+    for idx, strategy in enumerate(strategies):
+        budget = history.wait_budget(stream_config, strategy) if history else None
+        tier = {'name': strategy.name}
+        if budget:
+            tier['budget'] = budget
+        stats['tiers'].append(tier)
+        started = time.time()
+        capture = None
+        try:
+            capture = await run_strategy(strategy, stream_config, pool, tier, navigation, budget)
+        except Exception as e:
+            tier['error'] = str(e)
+            log(stream_config, f"[{strategy.name}] ❌ Error: {str(e)}")
+        if capture and not capture.found and capture.segments and config.SEGMENT_RESOLVE:
+            await resolve_segments(capture, stream_config, tier)
+        tier['elapsed'] = round(time.time() - started, 3)
+        tier['found'] = bool(capture and capture.found)
+
+        if tier['found']:
+            tier['time_to_first_playlist'] = round(capture.time_to_first(), 3)
+            stats['tier'] = strategy.name
+            return capture
+        segments = capture.segment_count if capture else 0
+        for url in (capture.video_urls() if capture else []):
+            log(stream_config, f"[{strategy.name}]   - {url[:100]}")
+        log(stream_config, f"[{strategy.name}] Nothing found"
+                           + (f" ({segments} segment(s) but no playlist)" if segments else "")
+                           + (", escalating..." if idx < len(strategies) - 1 else ""))
+    return None
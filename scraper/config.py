@@ -0,0 +1,175 @@
+"""
+Shared configuration for the scraper package
+"""
+import os
+import json
+
+# Firebase configuration
+FIREBASE_URL = os.getenv('FIREBASE_URL', 'https://cricket-stream-portal-default-rtdb.firebaseio.com')
+FIREBASE_AUTH = os.getenv('FIREBASE_AUTH', '')
+# Writes: keys per multi-path PATCH (0 = one request per run), timeout, retries and backoff base
+FIREBASE_BATCH_SIZE = int(os.getenv('FIREBASE_BATCH_SIZE', '0'))
+FIREBASE_TIMEOUT = float(os.getenv('FIREBASE_TIMEOUT', '10'))
+FIREBASE_RETRIES = int(os.getenv('FIREBASE_RETRIES', '3'))
+FIREBASE_BACKOFF = float(os.getenv('FIREBASE_BACKOFF', '0.5'))
+# Last written record per key, used to send heartbeats instead of full writes
+FIREBASE_STATE_FILE = os.getenv('FIREBASE_STATE_FILE', '.firebase_state.json')
+# Optional live mirror of the database over the streaming REST API (FIREBASE_MIRROR=1)
+FIREBASE_MIRROR = os.getenv('FIREBASE_MIRROR', '0') == '1'
+MIRROR_READY_TIMEOUT = float(os.getenv('MIRROR_READY_TIMEOUT', '5'))
+MIRROR_RECONNECT_DELAY = float(os.getenv('MIRROR_RECONNECT_DELAY', '5'))
+
+# Stream URLs to scrape
+STREAM_URLS = [
+    {
+        "url": "https://crichdplayer.com/willow-cricket-extra-live-stream-play-01",
+        "name": "Willow Cricket Extra",
+        "title": "Watch Stream Live Cricket on Willow Tv - CricHD"
+    }
+]
+
+# Browser settings
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36'
+VIEWPORT = {'width': 1920, 'height': 1080}
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--autoplay-policy=no-user-gesture-required'
+]
+
+# How many streams are scraped at the same time
+SCRAPE_CONCURRENCY = int(os.getenv('SCRAPE_CONCURRENCY', '4'))
+
+# Browser pool: warm browsers kept open, and contexts served before a browser is recycled
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '1'))
+BROWSER_MAX_USES = int(os.getenv('BROWSER_MAX_USES', '20'))
+
+# Navigation: wait_until mode and timeout (seconds); streams may set 'navigation' and
+# 'navigation_timeout' to override them
+NAVIGATION_MODE = os.getenv('NAVIGATION_MODE', 'domcontentloaded')
+NAVIGATION_TIMEOUT = float(os.getenv('NAVIGATION_TIMEOUT', '60'))
+
+# Request routing: set ROUTE_FILTER=0 to let every request through
+ROUTE_FILTER = os.getenv('ROUTE_FILTER', '1') != '0'
+BLOCK_RESOURCE_TYPES = ['image', 'font']
+BLOCK_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.ico',
+                    '.woff', '.woff2', '.ttf', '.otf']
+BLOCK_DOMAINS = [
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googletagmanager.com',
+    'google-analytics.com',
+    'adservice.google.com',
+    'popads.net',
+    'popcash.net',
+    'propellerads.com',
+    'adsterra.com',
+    'histats.com',
+    'disqus.com'
+]
+
+# Strategy cascade, cheapest first; later tiers only run when earlier ones find nothing
+STRATEGIES = [s.strip() for s in os.getenv('STRATEGIES', 'listener,cdp,aggressive,ultimate').split(',')
+              if s.strip()]
+
+# Interaction: frames are ranked by player signals and the best INTERACT_FRAMES are played
+# concurrently. Frame URLs containing one of PLAYER_URL_HINTS rank higher
+INTERACT_FRAMES = int(os.getenv('INTERACT_FRAMES', '3'))
+PLAYER_URL_HINTS = ('player', 'embed', 'jwplayer', 'jwpcdn', 'videojs', 'clappr', 'stream', 'live', 'hls')
+
+# Capture timing (seconds): waits end as soon as a playlist is seen, these are upper bounds
+INITIAL_WAIT = float(os.getenv('INITIAL_WAIT', '3'))
+CAPTURE_TIMEOUT = float(os.getenv('CAPTURE_TIMEOUT', '30'))
+# Extra time after the first playlist to catch a master playlist
+CAPTURE_SETTLE = float(os.getenv('CAPTURE_SETTLE', '2'))
+
+# Link cache: streams whose cached link lives longer than LINK_REFRESH_MARGIN seconds skip
+# the browser; links without an expiry token are trusted for LINK_DEFAULT_TTL seconds
+LINK_CACHE_FILE = os.getenv('LINK_CACHE_FILE', '.link_cache.json')
+LINK_REFRESH_MARGIN = float(os.getenv('LINK_REFRESH_MARGIN', '300'))
+LINK_DEFAULT_TTL = float(os.getenv('LINK_DEFAULT_TTL', '0'))
+
+# Harvesting: after navigation, and again before interacting, read playlists the page already
+# loaded (resource timing, video elements, player objects) from every frame
+HARVEST = os.getenv('HARVEST', '1') != '0'
+
+# Liveness probe: cached links are checked over plain HTTP before any browser is launched
+PROBE_LINKS = os.getenv('PROBE_LINKS', '1') != '0'
+PROBE_TIMEOUT = float(os.getenv('PROBE_TIMEOUT', '5'))
+
+# Playlist selection: captured candidates are fetched and parsed, and the stream publishes the
+# master playlist ('master') or its highest-bandwidth variant ('best'). HLS_SELECT=0 keeps the
+# URL-based pick
+HLS_SELECT = os.getenv('HLS_SELECT', '1') != '0'
+HLS_PUBLISH = os.getenv('HLS_PUBLISH', 'master')
+
+# Segment resolver: when a tier saw segments but no playlist, up to SEGMENT_RESOLVE_PROBES
+# likely playlist URLs next to the segments are fetched and parsed
+SEGMENT_RESOLVE = os.getenv('SEGMENT_RESOLVE', '1') != '0'
+SEGMENT_RESOLVE_PROBES = int(os.getenv('SEGMENT_RESOLVE_PROBES', '16'))
+
+# Static extraction: look for the playlist in page HTML/JS and iframes before using a browser.
+# Streams can set 'static': False to skip it
+STATIC_EXTRACT = os.getenv('STATIC_EXTRACT', '1') != '0'
+STATIC_MAX_DEPTH = int(os.getenv('STATIC_MAX_DEPTH', '3'))
+STATIC_TIMEOUT = float(os.getenv('STATIC_TIMEOUT', '10'))
+
+# Daemon mode (python -m scraper.daemon): longest gap between checks of a stream, first retry
+# delay after a failure (doubles on each further failure) and shortest gap between checks
+DAEMON_INTERVAL = float(os.getenv('DAEMON_INTERVAL', '600'))
+DAEMON_RETRY_DELAY = float(os.getenv('DAEMON_RETRY_DELAY', '60'))
+DAEMON_MIN_INTERVAL = float(os.getenv('DAEMON_MIN_INTERVAL', '30'))
+
+# Health monitor (daemon mode): re-probe every published link this often (0 = off), with up
+# to MONITOR_CONCURRENCY probes in flight
+MONITOR_INTERVAL = float(os.getenv('MONITOR_INTERVAL', '60'))
+MONITOR_CONCURRENCY = int(os.getenv('MONITOR_CONCURRENCY', '64'))
+# Consecutive transport errors or 5xx answers before a link is marked DOWN (4xx, stalls,
+# ended playlists and expired tokens count at once)
+MONITOR_FAILURES = int(os.getenv('MONITOR_FAILURES', '3'))
+
+# Source history: learned per source URL and used for wait budgets, refresh intervals and
+# backoff (failing sources wait DAEMON_RETRY_DELAY, doubling up to HISTORY_MAX_BACKOFF)
+HISTORY_FILE = os.getenv('HISTORY_FILE', '.source_history.json')
+HISTORY_ALPHA = 0.3
+HISTORY_MAX_BACKOFF = float(os.getenv('HISTORY_MAX_BACKOFF', '7200'))
+HISTORY_MIN_WAIT = 5.0
+
+# Run metrics: per-phase timings and counters written after each run (JSON), and optionally
+# in Prometheus text format for a node_exporter textfile collector
+METRICS_FILE = os.getenv('METRICS_FILE', 'scrape_metrics.json')
+METRICS_PROM_FILE = os.getenv('METRICS_PROM_FILE', '')
+
+# Profiling (--profile): report file (raw cProfile data goes next to it as .pstats), RSS
+# sampling interval, rows per table and traceback depth kept by tracemalloc
+PROFILE_FILE = os.getenv('PROFILE_FILE', 'scrape_profile.json')
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL', '0.5'))
+PROFILE_TOP = 25
+PROFILE_TRACE_FRAMES = 1
+
+# Capture buffer limits: playlists and segments kept per stream, recent URLs kept for debugging
+CAPTURE_MAX_PLAYLISTS = 32
+CAPTURE_MAX_SEGMENTS = 16
+CAPTURE_URL_LOG = 200
+
+
+def load_stream_urls():
+    """Return STREAM_URLS plus any custom URLs from STREAM_URLS_JSON"""
+    streams = list(STREAM_URLS)
+    custom_urls = os.getenv('STREAM_URLS_JSON')
+    if custom_urls:
+        try:
+            streams.extend(json.loads(custom_urls))
+        except ValueError as e:
+            print(f"⚠️  Ignoring invalid STREAM_URLS_JSON: {e}")
+    return streams
+
+
+def server_key(idx):
+    """Firebase key for the stream at position idx (same scheme as the scripts)"""
+    if idx >= 2:
+        return f"{idx + 1}thserverlink"
+    return f"{idx + 1}ndserverlink" if idx == 0 else f"{idx + 1}rdserverlink"
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Daemon mode - keeps browsers warm and refreshes each stream on its own schedule
+"""
+import asyncio
+import heapq
+import signal
+import time
+from datetime import datetime
+
+from playwright.async_api import async_playwright
+
+from . import config
+from .engine import (build_parser, flush_writes, parse_strategies, process_stream, start_mirror,
+                     stream_outcome)
+from .firebase import FirebaseWriter
+from .history import SourceHistory
+from .linkcache import LinkCache
+from .log import log
+from .metrics import metrics
+from .monitor import HealthMonitor
+from .pool import BrowserPool
+from .profiling import profiled
+from .strategies import get_strategies
+
+
+class Daemon:
+    """Runs streams from a priority queue ordered by when each one is next due.
+
+    A stream is due again shortly before its link expires. When the expiry is
+    unknown, it is due after the lifetime its source history has shown (at most
+    DAEMON_INTERVAL). After a failure it comes back with exponential backoff.
+    With a `monitor_interval`, published links are also health-checked in
+    between, and a stream whose link went down is due immediately.
+    """
+
+    def __init__(self, stream_configs, strategy_names=config.STRATEGIES,
+                 concurrency=config.SCRAPE_CONCURRENCY, browsers=config.BROWSER_POOL_SIZE,
+                 navigation=None, cache=None, writer=None, interval=config.DAEMON_INTERVAL,
+                 history=None, monitor_interval=config.MONITOR_INTERVAL,
+                 prometheus=config.METRICS_PROM_FILE, reuse_cache=True):
+        self.stream_configs = stream_configs
+        self.strategies = get_strategies(strategy_names)
+        self.concurrency = concurrency
+        self.browsers = browsers
+        self.navigation = navigation
+        self.cache = cache or LinkCache()
+        self.writer = writer or FirebaseWriter()
+        self.interval = interval
+        self.history = history or SourceHistory()
+        self.stats = [{'name': s['name'], 'source_url': s['url']} for s in stream_configs]
+        self.monitor_interval = monitor_interval
+        self.prometheus = prometheus
+        self.reuse_cache = reuse_cache
+        self.queue = []
+        self.due = {}
+        self.active = set()
+        self.running = set()
+        self._seq = 0
+        self._stop = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    def schedule(self, idx, due):
+        """Queue a stream; an earlier queue entry for it is dropped when popped"""
+        self._seq += 1
+        self.due[idx] = self._seq
+        heapq.heappush(self.queue, (due, self._seq, idx))
+        self._wakeup.set()
+
+    def link_down(self, idx, reason):
+        """Health monitor callback: forget the dead link and re-scrape the stream now"""
+        self.cache.invalidate(self.stream_configs[idx])
+        if idx not in self.active and not self._stop.is_set():
+            self.schedule(idx, time.time())
+
+    def next_due(self, idx, result, now=None):
+        """When a stream should be checked again"""
+        now = now or time.time()
+        stream_config = self.stream_configs[idx]
+        if not result:
+            return max(self.history.get(stream_config)['retry_at'], now + config.DAEMON_MIN_INTERVAL)
+
+        entry = self.cache.entries.get(stream_config['url'])
+        if entry and entry['expires'] is not None:
+            due = entry['expires'] - self.cache.refresh_margin
+            return min(max(due, now + config.DAEMON_MIN_INTERVAL), now + self.interval)
+        return now + self.history.refresh_interval(stream_config, self.interval)
+
+    def stop(self):
+        print("\nStopping daemon...")
+        self._stop.set()
+        self._wakeup.set()
+
+    async def run_stream(self, idx, pool, semaphore):
+        stream_config = self.stream_configs[idx]
+        stats = {'name': stream_config['name'], 'source_url': stream_config['url']}
+        self.active.add(idx)
+        try:
+            result = await process_stream(idx, stream_config, pool, self.strategies, semaphore,
+                                          self.cache, self.writer, stats, self.navigation, self.history,
+                                          self.reuse_cache)
+            self.stats[idx] = stats
+            metrics.set_tier(stream_config['name'], stream_outcome(stats))
+            await flush_writes(self.writer, self.stream_configs, self.stats, self.cache)
+            self.history.save()
+            metrics.save(prometheus_path=self.prometheus)
+        except Exception as e:
+            log(stream_config, f"❌ Error: {str(e)}")
+            result = None
+        finally:
+            self.active.discard(idx)
+        due = self.next_due(idx, result)
+        log(stream_config, f"Next check at {datetime.utcfromtimestamp(due).strftime('%H:%M:%S UTC')}")
+        if not self._stop.is_set():
+            self.schedule(idx, due)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        for idx in range(len(self.stream_configs)):
+            self.schedule(idx, time.time())
+
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        if self.monitor_interval > 0:
+            monitor = HealthMonitor(self.stream_configs, self.writer, self.link_down, self.monitor_interval)
+            self.running.add(asyncio.create_task(monitor.run(self._stop)))
+        async with async_playwright() as playwright:
+            pool = BrowserPool(playwright, size=self.browsers)
+            try:
+                while not self._stop.is_set():
+                    self._wakeup.clear()
+                    if self.queue and self.queue[0][0] <= time.time():
+                        _, seq, idx = heapq.heappop(self.queue)
+                        if self.due.get(idx) != seq:
+                            continue
+                        task = asyncio.create_task(self.run_stream(idx, pool, semaphore))
+                        self.running.add(task)
+                        task.add_done_callback(self.running.discard)
+                        continue
+                    timeout = self.queue[0][0] - time.time() if self.queue else None
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                if self.running:
+                    await asyncio.gather(*self.running, return_exceptions=True)
+            finally:
+                await pool.close()
+                await flush_writes(self.writer, self.stream_configs, self.stats, self.cache)
+                self.history.save()
+        print(f"Daemon stopped. Browser launches: {pool.launches}")
+
+
+def main(argv=None):
+    """Run the scraper as a resident daemon"""
+    parser = build_parser(description='Keep cricket stream links fresh as a long-running daemon')
+    parser.add_argument('--interval', type=float, default=config.DAEMON_INTERVAL,
+                        help='longest time in seconds between checks of a stream')
+    parser.add_argument('--monitor-interval', type=float, default=config.MONITOR_INTERVAL,
+                        help='seconds between health checks of published links (0 = off)')
+    args = parser.parse_args(argv)
+    strategy_names = parse_strategies(parser, args)
+
+    print("=" * 60)
+    print("Cricket Stream Scraper (Daemon)")
+    print("=" * 60)
+    print(f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print("=" * 60)
+
+    stream_configs = config.load_stream_urls()
+    print(f"\nStreams: {len(stream_configs)} (concurrency {args.concurrency}, "
+          f"strategies {args.strategies})")
+
+    mirror = start_mirror(args.mirror)
+    try:
+        daemon = Daemon(stream_configs, strategy_names, args.concurrency, args.browsers,
+                        args.navigation, LinkCache(path=None) if args.no_cache else LinkCache(),
+                        FirebaseWriter(mirror=mirror), args.interval,
+                        monitor_interval=args.monitor_interval, prometheus=args.prometheus,
+                        reuse_cache=not args.no_cache)
+        with profiled(args.profile):
+            asyncio.run(daemon.run())
+    finally:
+        if mirror:
+            mirror.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Async scraping engine - scrapes all streams concurrently with playwright.async_api
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from playwright.async_api import async_playwright
+
+from . import config
+from .cascade import run_cascade
+from .firebase import FirebaseWriter
+from .history import SourceHistory
+from .hls import PlaylistFetcher
+from .linkcache import LinkCache, parse_expiry
+from .mirror import RtdbMirror
+from .log import log
+from .metrics import metrics, print_phases
+from .navigation import NAVIGATION_MODES
+from .pool import BrowserPool
+from .profiling import profiled
+from .probe import probe_playlist
+from .results import build_result, save_results
+from .static import extract_static
+from .strategies import STRATEGIES, get_strategies
+
+# Parsed playlists shared by all streams, revalidated with ETag/Last-Modified
+playlists = PlaylistFetcher()
+
+
+async def scrape_stream(stream_config, pool, strategies, stats=None, navigation=None, history=None):
+    """Scrape a single stream URL for m3u8 links; timings are recorded into stats"""
+    log(stream_config, f"Scraping: {stream_config['url']}")
+    stats = stats if stats is not None else {}
+
+    if config.STATIC_EXTRACT and stream_config.get('static', True):
+        started = time.time()
+        with metrics.span('static_extract', stream_config['name']):
+            found = await asyncio.to_thread(extract_static, stream_config)
+        stats['static'] = {'elapsed': round(time.time() - started, 3), 'found': bool(found)}
+        if found:
+            stats['tier'] = 'static'
+            log(stream_config, f"✅ Found in page source (iframe depth {found['depth']}) after "
+                               f"{stats['static']['elapsed']:.1f}s: {found['link'][:80]}...")
+            return build_result(stream_config, found['link'], found['headers'])
+        log(stream_config, "Nothing in page source, using browser")
+
+    capture = await run_cascade(strategies, stream_config, pool, stats, navigation, history)
+    latest = capture.best() if capture else None
+    if not latest:
+        log(stream_config, "❌ No m3u8 link found")
+        return None
+
+    link, headers = latest.link, latest.headers
+    if config.HLS_SELECT:
+        candidates = [(p.link, p.headers, p.body) for p in capture.candidates()]
+        with metrics.span('playlist_select', stream_config['name']):
+            selected = await asyncio.to_thread(playlists.select, candidates)
+        if selected:
+            link, headers, playlist = selected
+            stats['playlist'] = {'master': playlist.is_master, 'variants': len(playlist.variants),
+                                 'candidates': len(candidates)}
+        else:
+            log(stream_config, "⚠️  No captured playlist parsed as live HLS, keeping URL pick")
+
+    stats['time_to_first_playlist'] = capture.time_to_first()
+    log(stream_config, f"✅ Success with {stats['tier']} after {capture.time_to_first():.1f}s! "
+                       f"Link: {link[:80]}...")
+    return build_result(stream_config, link, headers)
+
+
+def stream_outcome(s):
+    """How a stream's link was obtained, from its stats: a tier name, 'cache', 'probe',
+    'backoff', or None"""
+    if s.get('backoff'):
+        return 'backoff'
+    if s.get('cache') == 'hit':
+        return 'cache'
+    if s.get('probe', {}).get('ok'):
+        return 'probe'
+    return s.get('tier')
+
+
+def print_run_summary(stats):
+    """Average navigation time per mode and which tier succeeded per source"""
+    by_mode = {}
+    for s in stats:
+        for tier in s.get('tiers', []):
+            if 'navigation' in tier:
+                by_mode.setdefault(tier['navigation']['mode'], []).append(tier['navigation']['elapsed'])
+    for mode, times in by_mode.items():
+        print(f"   Navigation {mode}: {len(times)} page(s), avg {sum(times) / len(times):.1f}s")
+    for s in stats:
+        outcome = stream_outcome(s)
+        if outcome == 'backoff':
+            print(f"   {s['name']}: skipped, failing source in backoff")
+        elif outcome == 'cache':
+            print(f"   {s['name']}: cached link ({s['cache_remaining'] / 60:.0f} min left)")
+        elif outcome == 'probe':
+            print(f"   {s['name']}: cached link passed liveness probe")
+        else:
+            print(f"   {s['name']}: {outcome or 'no tier succeeded'}")
+
+
+def heartbeat(result):
+    """Cached result marked as checked now"""
+    return dict(result, status='OK', lastCheckedAt=int(time.time() * 1000))
+
+
+def seed_from_database(cache, writer, idx, stream_config):
+    """Fill an empty cache entry from the live record already published for this stream.
+
+    Records marked DOWN (by the health monitor or a failed write) are skipped, so a
+    link known to be dead is scraped again rather than republished.
+    """
+    published = writer.current(config.server_key(idx))
+    if (published and published.get('link') and published.get('status') == 'OK'
+            and published.get('source_url') == stream_config['url']):
+        cache.put(stream_config, published, now=published.get('lastCheckedAt', 0) / 1000 or None)
+
+
+async def probe_cached(cache, stream_config, stats, history=None):
+    """Probe the cached link of a stream; True if it is live and can be kept"""
+    entry = cache.probe_candidate(stream_config)
+    if not entry:
+        return False
+    with metrics.span('probe', stream_config['name']):
+        probe = await asyncio.to_thread(probe_playlist, entry['link'], entry['headers'], entry.get('probe'))
+    stats['probe'] = probe
+    if probe['ok']:
+        entry['probe'] = probe
+        log(stream_config, f"Cached link is live (media sequence {probe['media_sequence']}), skipping browser")
+        return True
+    log(stream_config, f"Cached link failed probe ({probe['reason']}), scraping")
+    if history and entry['expires'] is None:
+        # No token to read the lifetime from, so learn it from when the link died
+        history.record_lifetime(stream_config, probe['checked_at'] - entry['stored_at'])
+    cache.invalidate(stream_config)
+    return False
+
+
+async def process_stream(idx, stream_config, pool, strategies, semaphore, cache, writer, stats,
+                         navigation=None, history=None, reuse_cache=True):
+    """Cache, liveness probe, then the browser for one stream.
+
+    The record is queued on `writer`; browser work is limited by `semaphore`.
+    Sources that `history` has in backoff are not sent to the browser.
+    With reuse_cache=False the cache is only filled, never used to skip the
+    browser (the daemon's --no-cache still needs it to schedule by expiry).
+    Returns the result, or None if nothing was found.
+    """
+    if cache and reuse_cache and stream_config['url'] not in cache.entries:
+        seed_from_database(cache, writer, idx, stream_config)
+
+    if (cache and reuse_cache and config.PROBE_LINKS
+            and await probe_cached(cache, stream_config, stats, history)):
+        result = heartbeat(cache.entries[stream_config['url']]['result'])
+        writer.add(config.server_key(idx), result)
+        return result
+
+    cached = cache.get(stream_config) if cache and reuse_cache else None
+    if cached and not config.PROBE_LINKS:
+        stats['cache'] = 'hit'
+        stats['cache_remaining'] = cache.remaining(stream_config)
+        log(stream_config, "Cached link still valid, skipping browser")
+        result = heartbeat(cached)
+        writer.add(config.server_key(idx), result)
+        return result
+
+    if history and history.in_backoff(stream_config):
+        stats['backoff'] = True
+        log(stream_config, f"Failing source in backoff ({history.get(stream_config)['failures']} "
+                           f"failure(s)), skipping browser")
+        return None
+
+    async with semaphore:
+        result = await scrape_stream(stream_config, pool, strategies, stats, navigation, history)
+    if history:
+        history.record(stream_config, bool(result), stats.get('time_to_first_playlist'))
+    if result:
+        writer.add(config.server_key(idx), result)
+        if cache:
+            cache.put(stream_config, result)
+        if history and parse_expiry(result['link']):
+            history.record_lifetime(stream_config, parse_expiry(result['link']) - time.time())
+    return result
+
+
+async def flush_writes(writer, stream_configs, stats, cache):
+    """Flush queued Firebase writes and record the outcome per stream"""
+    with metrics.span('firebase_write'):
+        outcomes = await asyncio.to_thread(writer.flush)
+    for idx, stream_config in enumerate(stream_configs):
+        outcome = outcomes.get(config.server_key(idx))
+        if outcome:
+            stats[idx]['firebase'] = outcome
+            if not outcome['ok'] and cache:
+                # Not published, so do not let the cache skip it next run
+                cache.invalidate(stream_config)
+    if cache:
+        cache.save()
+
+
+async def scrape_all(stream_configs, concurrency=config.SCRAPE_CONCURRENCY,
+                     browsers=config.BROWSER_POOL_SIZE, navigation=None,
+                     strategy_names=config.STRATEGIES, cache=None, writer=None, history=None):
+    """Scrape every stream, at most `concurrency` at a time.
+
+    Streams with a still-valid link in `cache` skip the browser. With PROBE_LINKS,
+    cached links are probed over HTTP first and only failures go to the browser.
+    New results are queued on `writer` and written in one batch at the end.
+    `history` is updated with each browser attempt and saved at the end.
+    Returns (results, stats), both in input order.
+    """
+    strategies = get_strategies(strategy_names)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results = [None] * len(stream_configs)
+    stats = [{'name': s['name'], 'source_url': s['url']} for s in stream_configs]
+    writer = writer or FirebaseWriter()
+
+    async with async_playwright() as playwright:
+        pool = BrowserPool(playwright, size=browsers)
+
+        async def run(idx, stream_config):
+            try:
+                results[idx] = await process_stream(idx, stream_config, pool, strategies, semaphore,
+                                                    cache, writer, stats[idx], navigation, history)
+            except Exception as e:
+                # One broken stream must not cost the others their write and heartbeat
+                stats[idx]['error'] = str(e)
+                log(stream_config, f"❌ Error: {e}")
+                results[idx] = None
+
+        try:
+            await asyncio.gather(*(run(idx, s) for idx, s in enumerate(stream_configs)))
+        finally:
+            await pool.close()
+
+        for s in stats:
+            metrics.set_tier(s['name'], stream_outcome(s))
+        await flush_writes(writer, stream_configs, stats, cache)
+        if history:
+            history.save()
+        print(f"\nBrowser launches: {pool.launches}")
+        print_run_summary(stats)
+
+    return results, stats
+
+
+def build_parser(description='Scrape cricket streams concurrently', strategies=None):
+    """Command line options shared by the one-shot scraper and the daemon"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--concurrency', type=int, default=config.SCRAPE_CONCURRENCY,
+                        help='number of streams scraped at the same time')
+    parser.add_argument('--browsers', type=int, default=config.BROWSER_POOL_SIZE,
+                        help='number of warm browsers shared by all streams')
+    parser.add_argument('--navigation', choices=NAVIGATION_MODES, default=None,
+                        help='default page.goto wait_until mode (streams can override it)')
+    parser.add_argument('--strategies', default=','.join(strategies or config.STRATEGIES),
+                        help=f"comma-separated cascade, cheapest first ({', '.join(STRATEGIES)})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help='scrape every stream even if its cached link is still valid')
+    parser.add_argument('--mirror', action='store_true', default=config.FIREBASE_MIRROR,
+                        help='read current Firebase state through a streaming mirror')
+    parser.add_argument('--prometheus', metavar='PATH', default=config.METRICS_PROM_FILE,
+                        help='also write run metrics in Prometheus text format to PATH')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'profile CPU, allocations and browser memory into {config.PROFILE_FILE}')
+    return parser
+
+
+def parse_strategies(parser, args):
+    """Strategy names from --strategies, rejecting unknown ones"""
+    names = [s.strip() for s in args.strategies.split(',') if s.strip()]
+    try:
+        get_strategies(names)
+    except ValueError as e:
+        parser.error(str(e))
+    return names
+
+
+def start_mirror(enabled):
+    """Start the Firebase mirror if enabled; returns it or None"""
+    if not enabled:
+        return None
+    mirror = RtdbMirror().start()
+    if not mirror.wait_ready():
+        print("⚠️  Firebase mirror not ready, using local state")
+    return mirror
+
+
+def main(argv=None, title='Async Engine', strategies=None):
+    """Main scraper function; `strategies` changes the default cascade"""
+    parser = build_parser(strategies=strategies)
+    args = parser.parse_args(argv)
+    strategy_names = parse_strategies(parser, args)
+
+    print("=" * 60)
+    print(f"Cricket Stream Scraper ({title})")
+    print("=" * 60)
+    print(f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print("=" * 60)
+
+    stream_configs = config.load_stream_urls()
+    print(f"\nStreams to scrape: {len(stream_configs)} (concurrency {args.concurrency}, "
+          f"strategies {args.strategies})")
+
+    started = time.time()
+    mirror = start_mirror(args.mirror)
+    try:
+        with profiled(args.profile):
+            results, stats = asyncio.run(scrape_all(
+                stream_configs, args.concurrency, args.browsers, args.navigation, strategy_names,
+                None if args.no_cache else LinkCache(), FirebaseWriter(mirror=mirror), SourceHistory()))
+    finally:
+        if mirror:
+            mirror.stop()
+    results = [r for r in results if r]
+
+    print("\n" + "=" * 60)
+    print(f"Scraping complete. Found {len(results)}/{len(stream_configs)} streams "
+          f"in {time.time() - started:.1f}s.")
+    print("=" * 60)
+
+    metrics.save(prometheus_path=args.prometheus)
+    print_phases(metrics.report())
+    print(f"Metrics saved to: {config.METRICS_FILE}")
+
+    if results:
+        save_results(results)
+        print("\nSuccessful streams:")
+        for r in results:
+            print(f"  - {r['name']}: {r['link'][:60]}...")
+    else:
+        print("\n⚠️  No m3u8 links found.")
+
+
+if __name__ == '__main__':
+    main()
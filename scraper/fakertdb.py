@@ -0,0 +1,266 @@
+"""
+Local Firebase RTDB stand-in - the REST API subset the scraper uses, for tests and load runs.
+
+Supported: GET/PUT/PATCH/DELETE on `<path>.json`, multi-path PATCH, `auth=`
+(401 if it does not match), `print=silent` (204, no body), ETags
+(`X-Firebase-ETag: true` on reads, `if-match` on writes, 412 on mismatch) and
+streaming (`Accept: text/event-stream`) with put/patch events and keep-alives.
+`fail_rate` and `latency` inject 503s and slow answers for retry testing.
+"""
+import copy
+import hashlib
+import json
+import queue
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _segments(path):
+    return [p for p in path.split('/') if p]
+
+
+def etag(value):
+    return hashlib.md5(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def prune(value):
+    """Drop nulls and empty objects, as RTDB does not store them"""
+    if isinstance(value, dict):
+        value = {k: prune(v) for k, v in value.items()}
+        value = {k: v for k, v in value.items() if v is not None}
+        return value or None
+    return value
+
+
+class FakeRtdbHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, body=None, headers=None):
+        data = b'' if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def parse(self):
+        """(path segments, query) of the request, or None after replying with an error.
+
+        The request body is always read first, so an error reply leaves the
+        keep-alive connection usable.
+        """
+        length = int(self.headers.get('Content-Length') or 0)
+        self.raw_body = self.rfile.read(length)
+        self.server.db.count('bytes_received', length)
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        db = self.server.db
+        db.count(self.command)
+        if db.latency:
+            time.sleep(db.latency)
+        if db.auth and query.get('auth') != db.auth:
+            self.reply(401, {'error': 'Permission denied'})
+            return None
+        if not parsed.path.endswith('.json'):
+            self.reply(400, {'error': 'Invalid path: paths must end in .json'})
+            return None
+        if self.command != 'GET' and db.fail_rate and random.random() < db.fail_rate:
+            self.reply(503, {'error': 'Service unavailable (injected)'})
+            return None
+        return _segments(parsed.path[:-5]), query
+
+    def body(self):
+        return json.loads(self.raw_body or b'null')
+
+    def do_GET(self):
+        parsed = self.parse()
+        if not parsed:
+            return
+        keys, _ = parsed
+        if 'text/event-stream' in self.headers.get('Accept', ''):
+            return self.stream(keys)
+        value = self.server.db.get(keys)
+        headers = {'ETag': etag(value)} if self.headers.get('X-Firebase-ETag') == 'true' else None
+        self.reply(200, value, headers)
+
+    def write(self, apply):
+        parsed = self.parse()
+        if not parsed:
+            return
+        keys, query = parsed
+        try:
+            data = self.body()
+        except ValueError:
+            return self.reply(400, {'error': 'Invalid data; couldn\'t parse JSON object'})
+        db = self.server.db
+        with db.lock:
+            expected = self.headers.get('if-match')
+            if expected and expected != etag(db.get(keys)):
+                return self.reply(412, db.get(keys), {'ETag': etag(db.get(keys))})
+            apply(keys, data)
+            value = db.get(keys)
+        if query.get('print') == 'silent':
+            return self.reply(204)
+        self.reply(200, data if self.command == 'PATCH' else value)
+
+    def do_PUT(self):
+        self.write(self.server.db.put)
+
+    def do_PATCH(self):
+        self.write(self.server.db.patch)
+
+    def do_DELETE(self):
+        self.write(lambda keys, _: self.server.db.put(keys, None))
+
+    def stream(self, keys):
+        db = self.server.db
+        events = db.subscribe(keys)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            while not db.stopped.is_set():
+                try:
+                    event, payload = events.get(timeout=db.keep_alive)
+                except queue.Empty:
+                    event, payload = 'keep-alive', None
+                chunk = f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode()
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                self.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            db.unsubscribe(events)
+            self.close_connection = True
+
+
+class FakeRtdb:
+    """In-memory database behind a local HTTP server run in a background thread.
+
+        with FakeRtdb(auth='secret') as db:
+            writer = FirebaseWriter(base_url=db.url, auth='secret')
+            ...
+            db.get(['1ndserverlink'])
+    """
+
+    def __init__(self, auth='', fail_rate=0.0, latency=0.0, keep_alive=30):
+        self.auth = auth
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.keep_alive = keep_alive
+        self.tree = None
+        self.counters = {}
+        self.lock = threading.RLock()
+        self.stopped = threading.Event()
+        self._subscribers = []
+        self._server = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), FakeRtdbHandler)
+        self._server.daemon_threads = True
+        self._server.db = self
+        threading.Thread(target=self._server.serve_forever, name='fakertdb', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def get(self, keys):
+        with self.lock:
+            node = self.tree
+            for key in keys:
+                if not isinstance(node, dict):
+                    return None
+                node = node.get(key)
+            return copy.deepcopy(node)
+
+    def _set(self, keys, value):
+        value = prune(value)
+        if not keys:
+            self.tree = value
+            return
+        if not isinstance(self.tree, dict):
+            self.tree = {}
+        parents, node = [], self.tree
+        for key in keys[:-1]:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            parents.append((node, key))
+            node = node[key]
+        if value is None:
+            node.pop(keys[-1], None)
+            # Remove parents left empty, like RTDB does
+            while parents and not node:
+                parent, key = parents.pop()
+                del parent[key]
+                node = parent
+        else:
+            node[keys[-1]] = value
+        self.tree = self.tree or None
+
+    def put(self, keys, data):
+        with self.lock:
+            self._set(keys, copy.deepcopy(data))
+            self._notify([(keys, data)])
+
+    def patch(self, keys, data):
+        """Multi-path update: each key of data may itself be a path below keys"""
+        with self.lock:
+            writes = [(keys + _segments(path), value) for path, value in (data or {}).items()]
+            for path, value in writes:
+                self._set(path, copy.deepcopy(value))
+            self._notify(writes)
+
+    def subscribe(self, keys):
+        """Queue of (event, payload) for a new listener, starting with the current value"""
+        events = queue.Queue()
+        with self.lock:
+            events.put(('put', {'path': '/', 'data': self.get(keys)}))
+            self._subscribers.append((keys, events))
+        return events
+
+    def unsubscribe(self, events):
+        with self.lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not events]
+
+    def _notify(self, writes):
+        for keys, events in self._subscribers:
+            if any(path[:len(keys)] != keys and keys[:len(path)] == path for path, _ in writes):
+                # A write above the listener's path replaces its whole subtree
+                events.put(('put', {'path': '/', 'data': self.get(keys)}))
+                continue
+            below = {'/'.join(path[len(keys):]): value for path, value in writes
+                     if path[:len(keys)] == keys}
+            if not below:
+                continue
+            if len(writes) == 1:
+                (path, value), = below.items()
+                events.put(('put', {'path': '/' + path, 'data': value}))
+            else:
+                events.put(('patch', {'path': '/', 'data': below}))
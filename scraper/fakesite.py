@@ -0,0 +1,270 @@
+"""
+Fake streaming site for benchmarks - nested iframes, a click-to-play player, tokenized HLS and ads.
+
+Every host name is served by one local HTTP server. Chromium is started with a
+--host-resolver-rules mapping that sends all host names to it, so nothing leaves
+the machine:
+
+    cricket.test      the match page: ad scripts, images, fonts, an ad iframe and
+                      an iframe to embed.test
+    embed.test        an embed page with a nested iframe to player.test
+    player.test       the player: a <video> and a play button; it requests the
+                      tokenized master playlist `delay` seconds after play (or
+                      after load in the 'autoplay' scenario)
+    cdn.test          master/media playlists and .ts segments; a missing or
+                      expired token gets a 403
+    ad domains        doubleclick.net, google-analytics.com, popads.net: scripts,
+                      beacons and a click-stealing ad frame
+"""
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+SCENARIOS = ('autoplay', 'click', 'delayed')
+AD_HOSTS = ('doubleclick.net', 'google-analytics.com', 'popads.net')
+SEGMENT_SECONDS = 2
+
+MATCH_PAGE = """<!DOCTYPE html>
+<html><head><title>Fake Cricket Live</title>
+<link rel="stylesheet" href="/style.css">
+<script src="http://doubleclick.net:{port}/ads.js"></script>
+</head><body>
+<h1>Live Cricket</h1>
+<img src="/img/banner1.jpg"><img src="/img/banner2.jpg"><img src="/img/logo.png">
+<iframe src="http://popads.net:{port}/frame" width="300" height="250"></iframe>
+<iframe src="http://embed.test:{port}/embed?{query}" width="960" height="540" allowfullscreen></iframe>
+<script>setInterval(() => fetch('/api/score?t=' + Date.now()), 500);</script>
+</body></html>"""
+
+EMBED_PAGE = """<!DOCTYPE html>
+<html><head><title>Embed</title>
+<script src="http://google-analytics.com:{port}/analytics.js"></script>
+</head><body style="margin:0">
+<iframe src="http://player.test:{port}/player?{query}" width="960" height="540" allowfullscreen></iframe>
+</body></html>"""
+
+PLAYER_PAGE = """<!DOCTYPE html>
+<html><head><title>Player</title>
+<style>.play-button {{ position:absolute; top:45%; left:45%; width:80px; height:80px; }}</style>
+</head><body style="margin:0">
+<video id="player" width="960" height="540" muted playsinline></video>
+<button class="play-button" aria-label="Play">&#9654;</button>
+<script>
+(function () {{
+    var host = ['cdn', 'test'].join('.') + ':{port}';
+    var path = ['live', 'master'].join('/') + '.m3u' + '8';
+    var token = '{token}', expires = {expires}, delay = {delay}, autoplay = {autoplay};
+    var started = false;
+
+    function fetchText(url) {{ return fetch(url).then(function (r) {{ return r.text(); }}); }}
+
+    function load() {{
+        var master = 'http://' + host + '/' + path + '?token=' + token + '&expires=' + expires;
+        fetchText(master).then(function (text) {{
+            var variant = text.split('\\n').filter(function (l) {{ return l && l[0] !== '#'; }}).pop();
+            var media = new URL(variant, master).href;
+            function poll() {{
+                fetchText(media).then(function (text) {{
+                    var segments = text.split('\\n').filter(function (l) {{ return l && l[0] !== '#'; }});
+                    return fetch(new URL(segments[segments.length - 1], media).href);
+                }}).catch(function () {{}});
+                setTimeout(poll, {segment_ms});
+            }}
+            poll();
+        }}).catch(function () {{}});
+    }}
+
+    function start() {{
+        if (started) return;
+        started = true;
+        setTimeout(load, delay * 1000);
+    }}
+
+    var video = document.getElementById('player');
+    video.addEventListener('play', start);
+    video.addEventListener('click', start);
+    document.querySelector('.play-button').addEventListener('click', start);
+    if (autoplay) start();
+}})();
+</script>
+</body></html>"""
+
+AD_SCRIPT = """
+setInterval(function () {{
+    new Image().src = 'http://google-analytics.com:{port}/collect?t=' + Date.now();
+}}, 250);
+"""
+
+AD_FRAME = """<!DOCTYPE html>
+<html><body><button class="play" onclick="fetch('/click?t=' + Date.now())">Play now!</button></body></html>"""
+
+
+class FakeSiteHandler(BaseHTTPRequestHandler):
+    """Routes requests by Host header; the server keeps tokens and byte counters"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, body, content_type, category, status=200):
+        if isinstance(body, str):
+            body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.site.count(category, len(body))
+
+    def do_GET(self):
+        site = self.server.site
+        host = (self.headers.get('Host') or '').split(':')[0].lower()
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        path = parsed.path
+        port = self.server.server_port
+
+        if host in AD_HOSTS:
+            if path.endswith('.js'):
+                return self.send(AD_SCRIPT.format(port=port), 'application/javascript', 'ad')
+            if path == '/frame':
+                return self.send(AD_FRAME, 'text/html', 'ad')
+            return self.send(b'GIF89a', 'image/gif', 'ad')
+
+        if host == 'cricket.test':
+            if path == '/watch':
+                return self.send(MATCH_PAGE.format(port=port, query=parsed.query), 'text/html', 'page')
+            if path.endswith(('.jpg', '.png')):
+                return self.send(b'\x00' * 20000, 'image/jpeg', 'noise')
+            if path.endswith('.css'):
+                return self.send("@font-face { font-family: f; src: url('/fonts/f.woff2'); } "
+                                 "body { font-family: f; }", 'text/css', 'noise')
+            if path.endswith('.woff2'):
+                return self.send(b'\x00' * 30000, 'font/woff2', 'noise')
+            return self.send('{"score": "123/4"}', 'application/json', 'noise')
+
+        if host == 'embed.test':
+            return self.send(EMBED_PAGE.format(port=port, query=parsed.query), 'text/html', 'page')
+
+        if host == 'player.test':
+            scenario = query.get('scenario', 'click')
+            delay = float(query.get('delay', site.delay if scenario == 'delayed' else 0))
+            token, expires = site.issue_token()
+            return self.send(PLAYER_PAGE.format(
+                port=port, token=token, expires=expires, delay=delay,
+                autoplay='true' if scenario == 'autoplay' else 'false',
+                segment_ms=SEGMENT_SECONDS * 1000), 'text/html', 'page')
+
+        if host == 'cdn.test':
+            if not site.valid_token(query.get('token')):
+                return self.send('Forbidden', 'text/plain', 'playlist', status=403)
+            if path.endswith('.m3u8'):
+                time.sleep(site.latency)
+                return self.send(site.playlist(path, query['token']), 'application/vnd.apple.mpegurl',
+                                 'playlist')
+            if path.endswith('.ts'):
+                return self.send(b'\x47' * site.segment_size, 'video/mp2t', 'segment')
+
+        self.send('Not found', 'text/plain', 'other', status=404)
+
+
+class FakeSite:
+    """The fake site's server, run in a background thread.
+
+        with FakeSite(delay=3) as site:
+            stream_config = site.stream_config('click')
+            ...
+            site.bytes_sent, site.requests
+
+    `delay` is how long the player waits after play in the 'delayed' scenario,
+    `latency` a server-side delay on every playlist response.
+    """
+
+    def __init__(self, delay=5.0, latency=0.0, segment_size=256 * 1024, token_ttl=3600):
+        self.delay = delay
+        self.latency = latency
+        self.segment_size = segment_size
+        self.token_ttl = token_ttl
+        self.tokens = {}
+        self.bytes_sent = {}
+        self.requests = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def port(self):
+        return self._server.server_port
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), FakeSiteHandler)
+        self._server.daemon_threads = True
+        self._server.site = self
+        threading.Thread(target=self._server.serve_forever, name='fakesite', daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def browser_args(self):
+        """Chromium flags that resolve every host name to this server"""
+        return [f'--host-resolver-rules=MAP * 127.0.0.1:{self.port}']
+
+    def stream_config(self, scenario='click', delay=None):
+        """Stream config for the match page of a scenario"""
+        query = {'scenario': scenario}
+        if delay is not None:
+            query['delay'] = delay
+        return {
+            'url': f'http://cricket.test:{self.port}/watch?{urlencode(query)}',
+            'name': f'Fake {scenario}',
+            'title': 'Fake Cricket Live',
+            'static': False
+        }
+
+    def count(self, category, size):
+        with self._lock:
+            self.bytes_sent[category] = self.bytes_sent.get(category, 0) + size
+            self.requests[category] = self.requests.get(category, 0) + 1
+
+    def reset_counters(self):
+        with self._lock:
+            self.bytes_sent = {}
+            self.requests = {}
+
+    def issue_token(self):
+        token = secrets.token_hex(8)
+        expires = int(time.time() + self.token_ttl)
+        with self._lock:
+            self.tokens[token] = expires
+        return token, expires
+
+    def valid_token(self, token):
+        return self.tokens.get(token, 0) > time.time()
+
+    def playlist(self, path, token):
+        """Master playlist with two variants, or a live media playlist of three segments"""
+        if path.endswith('/master.m3u8'):
+            return (f"#EXTM3U\n"
+                    f"#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360\n"
+                    f"360p/index.m3u8?token={token}\n"
+                    f"#EXT-X-STREAM-INF:BANDWIDTH=2500000,RESOLUTION=1280x720\n"
+                    f"720p/index.m3u8?token={token}\n")
+        sequence = int((time.time() - self.started) / SEGMENT_SECONDS)
+        lines = ['#EXTM3U', '#EXT-X-VERSION:3', f'#EXT-X-TARGETDURATION:{SEGMENT_SECONDS}',
+                 f'#EXT-X-MEDIA-SEQUENCE:{sequence}']
+        for n in range(sequence, sequence + 3):
+            lines += [f'#EXTINF:{SEGMENT_SECONDS}.0,', f'seg{n}.ts?token={token}']
+        return '\n'.join(lines) + '\n'
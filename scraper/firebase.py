@@ -0,0 +1,174 @@
+"""
+Firebase RTDB writer - pooled session, batched multi-path PATCH with retries
+"""
+import json
+import threading
+import time
+
+import requests
+
+from . import config
+from .jsonfile import load_json, save_json_atomic
+from .metrics import metrics
+
+# Worth retrying: rate limiting and server-side errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def is_unchanged(previous, data):
+    """True if a record only needs a heartbeat: same link and headers as last written"""
+    return bool(previous) and previous.get('link') == data['link'] \
+        and previous.get('headers') == data['headers']
+
+
+class FirebaseWriter:
+    """Collects records for a run and writes them with multi-path PATCHes at the RTDB root.
+
+    One requests.Session is reused for keep-alive. Each chunk of up to
+    `batch_size` keys (0 = everything in one request) is retried with
+    exponential backoff on timeouts, connection errors and 429/5xx.
+
+    The last written record per key is kept in `state_file`, or read from a
+    ready RtdbMirror when one is given. A record whose link and headers did not
+    change is written as a heartbeat of lastCheckedAt and status only, so
+    createdAt survives and listeners see no link change.
+
+    add() and mark() may be called while another thread flushes.
+    """
+
+    def __init__(self, base_url=None, auth=None, batch_size=config.FIREBASE_BATCH_SIZE,
+                 timeout=config.FIREBASE_TIMEOUT, retries=config.FIREBASE_RETRIES,
+                 backoff=config.FIREBASE_BACKOFF, session=None,
+                 state_file=config.FIREBASE_STATE_FILE, mirror=None, verbose=True):
+        self.base_url = (base_url or config.FIREBASE_URL).rstrip('/')
+        self.auth = config.FIREBASE_AUTH if auth is None else auth
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = session or requests.Session()
+        self.pending = {}
+        self.retry_count = 0
+        self.state_file = state_file
+        self.known = {}
+        self.mirror = mirror
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.load_state()
+
+    def load_state(self):
+        self.known = load_json(self.state_file, 'Firebase state') or {}
+
+    def save_state(self):
+        save_json_atomic(self.state_file, self.known)
+
+    def url(self, path=''):
+        """REST URL for a path; print=silent makes RTDB answer 204 with no body"""
+        url = f"{self.base_url}/{path}.json?print=silent"
+        if self.auth:
+            url += f"&auth={self.auth}"
+        return url
+
+    def current(self, server_key):
+        """Record currently stored under a key, as far as we know"""
+        if self.mirror and self.mirror.ready.is_set():
+            return self.mirror.get(server_key)
+        return self.known.get(server_key)
+
+    def add(self, server_key, data):
+        """Queue a record as a full write or, if unchanged, a heartbeat; written by flush()"""
+        previous = self.current(server_key)
+        if is_unchanged(previous, data):
+            updates = {
+                f"{server_key}/lastCheckedAt": data['lastCheckedAt'],
+                f"{server_key}/status": data['status']
+            }
+            record = dict(previous, lastCheckedAt=data['lastCheckedAt'], status=data['status'])
+            if 'statusReason' in record:
+                updates[f"{server_key}/statusReason"] = None
+                del record['statusReason']
+            kind = 'heartbeat'
+        else:
+            updates = {server_key: data}
+            record = data
+            kind = 'full'
+        with self._lock:
+            self.pending[server_key] = (kind, updates, record)
+
+    def mark(self, server_key, status, reason, checked_at):
+        """Queue a status change (e.g. 'DOWN') for a published record; False if none is known"""
+        previous = self.current(server_key)
+        if not previous:
+            return False
+        updates = {
+            f"{server_key}/status": status,
+            f"{server_key}/statusReason": reason,
+            f"{server_key}/lastCheckedAt": checked_at
+        }
+        record = dict(previous, status=status, statusReason=reason, lastCheckedAt=checked_at)
+        with self._lock:
+            self.pending[server_key] = ('status', updates, record)
+        return True
+
+    def _patch(self, updates):
+        """PATCH one chunk; returns (ok, status, attempts, error)"""
+        status, error = None, None
+        body = json.dumps(updates)
+        for attempt in range(1, self.retries + 2):
+            metrics.count('firebase_requests')
+            metrics.count('firebase_bytes_sent', len(body))
+            try:
+                response = self.session.patch(self.url(), data=body, timeout=self.timeout,
+                                              headers={'Content-Type': 'application/json'})
+                status = response.status_code
+                if status in (200, 204):
+                    return True, status, attempt, None
+                error = response.text[:200]
+                if status not in RETRY_STATUSES:
+                    break
+            except requests.RequestException as e:
+                error = str(e)
+            if attempt <= self.retries:
+                self.retry_count += 1
+                metrics.count('firebase_retries')
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+        return False, status, attempt, error
+
+    def flush(self):
+        """Write everything pending; returns {server_key: outcome} for each key.
+
+        Flushes run one at a time. Records queued while a flush is in progress
+        are kept for the next one.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = dict(self.pending)
+            keys = list(pending)
+            size = self.batch_size or len(keys) or 1
+            outcomes = {}
+            for start in range(0, len(keys), size):
+                chunk = keys[start:start + size]
+                updates = {}
+                for key in chunk:
+                    updates.update(pending[key][1])
+                ok, status, attempts, error = self._patch(updates)
+                for key in chunk:
+                    kind, _, record = pending[key]
+                    outcomes[key] = {'ok': ok, 'kind': kind, 'status': status,
+                                     'attempts': attempts, 'error': error}
+                    if ok:
+                        with self._lock:
+                            if self.pending.get(key) is pending[key]:
+                                del self.pending[key]
+                        self.known[key] = record
+                        if self.verbose:
+                            print(f"✅ Saved to Firebase: {key} ({kind})")
+                    else:
+                        print(f"❌ Firebase error for {key}: {status} - {error}")
+            if outcomes:
+                self.save_state()
+            return outcomes
+
+    def close(self):
+        self.session.close()
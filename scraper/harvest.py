@@ -0,0 +1,89 @@
+"""
+Playlist harvesting - reads playlists a page already loaded from inside every frame
+"""
+from . import config
+from .capture import is_playlist, is_playlist_type
+from .log import log
+from .metrics import metrics
+from .results import implied_headers
+
+# Everything a frame knows about media it already requested: resource timing entries, video
+# elements and the sources held by hls.js, video.js, JW Player and Clappr instances.
+# Returns [[url, type], ...] and the frame's user agent
+HARVEST_SCRIPT = """
+    () => {
+        const found = [];
+        const add = (url, type) => {
+            if (typeof url === 'string' && /^https?:/i.test(url)) found.push([url, type || '']);
+        };
+        const addSources = sources => {
+            (Array.isArray(sources) ? sources : [sources]).forEach(s => {
+                if (!s) return;
+                if (typeof s === 'string') add(s);
+                else add(s.src || s.file || s.source, s.type);
+            });
+        };
+        try {
+            performance.getEntriesByType('resource').forEach(e => add(e.name, e.initiatorType));
+        } catch (e) {}
+        document.querySelectorAll('video, audio, source').forEach(el => {
+            add(el.currentSrc, el.type);
+            add(el.src, el.type);
+        });
+        try {
+            if (window.videojs && videojs.getPlayers) {
+                Object.values(videojs.getPlayers()).forEach(p => {
+                    if (p) addSources(p.currentSources ? p.currentSources() : p.currentSrc());
+                });
+            }
+        } catch (e) {}
+        try {
+            if (typeof window.jwplayer === 'function') {
+                const jw = jwplayer();
+                (jw.getPlaylist ? jw.getPlaylist() || [] : []).forEach(item => {
+                    add(item.file);
+                    addSources(item.sources);
+                });
+            }
+        } catch (e) {}
+        // hls.js and Clappr keep no registry of instances; look at page globals instead
+        const names = Object.keys(window).slice(0, 2000);
+        for (const name of names) {
+            let value;
+            try { value = window[name]; } catch (e) { continue; }
+            if (!value || typeof value !== 'object' || value === window) continue;
+            try {
+                if (typeof value.url === 'string' && value.media !== undefined) add(value.url);
+                if (value.options && (value.options.source || value.options.sources)) {
+                    addSources(value.options.source);
+                    addSources(value.options.sources);
+                }
+            } catch (e) {}
+        }
+        return {urls: found, userAgent: navigator.userAgent};
+    }
+"""
+
+
+async def harvest(page, capture, stream_config):
+    """Add playlists already loaded by any frame of the page to capture.
+
+    This catches players that requested their playlist before our listeners
+    were in place. Headers are rebuilt from the frame that holds the URL.
+    Returns the number of new playlists.
+    """
+    added = 0
+    with metrics.span('harvest', stream_config['name']):
+        for frame in page.frames:
+            try:
+                result = await frame.evaluate(HARVEST_SCRIPT)
+            except Exception:
+                # Detached or navigating frame
+                continue
+            headers = implied_headers(frame.url, result.get('userAgent') or config.USER_AGENT)
+            for url, kind in result.get('urls', []):
+                if (is_playlist(url) or is_playlist_type(kind)) and capture.add(url, headers):
+                    added += 1
+                    log(stream_config, f"✅ Harvested m3u8 from page: {url[:80]}...")
+    metrics.count('harvested_playlists', added)
+    return added
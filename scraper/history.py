@@ -0,0 +1,97 @@
+"""
+Per-source history - learns token lifetime, time-to-first-playlist and success rate
+"""
+import time
+
+from . import config
+from .jsonfile import load_json, save_json_atomic
+
+
+def ewma(old, new, alpha=config.HISTORY_ALPHA):
+    """Exponentially weighted moving average; the first sample is taken as is"""
+    return new if old is None else old + alpha * (new - old)
+
+
+class SourceHistory:
+    """What each source URL has done in past runs, persisted to a JSON file.
+
+    Used to size per-source wait budgets, pick refresh intervals for links
+    without an expiry token, and back off exponentially on failing sources.
+    """
+
+    def __init__(self, path=config.HISTORY_FILE):
+        self.path = path
+        self.sources = {}
+        self.load()
+
+    def load(self):
+        self.sources = load_json(self.path, 'source history') or {}
+
+    def save(self):
+        save_json_atomic(self.path, self.sources)
+
+    def get(self, stream_config):
+        return self.sources.setdefault(stream_config['url'], {
+            'attempts': 0,
+            'successes': 0,
+            'success_rate': None,
+            'time_to_first': None,
+            'lifetime': None,
+            'failures': 0,
+            'last_attempt': None,
+            'retry_at': 0
+        })
+
+    def record(self, stream_config, success, time_to_first=None, now=None):
+        """Record a browser attempt and update the backoff window"""
+        now = now or time.time()
+        source = self.get(stream_config)
+        source['attempts'] += 1
+        source['last_attempt'] = now
+        source['success_rate'] = ewma(source['success_rate'], 1.0 if success else 0.0)
+        if success:
+            source['successes'] += 1
+            source['failures'] = 0
+            source['retry_at'] = 0
+            if time_to_first is not None:
+                source['time_to_first'] = ewma(source['time_to_first'], time_to_first)
+        else:
+            source['failures'] += 1
+            source['retry_at'] = now + self.backoff_delay(stream_config)
+
+    def record_lifetime(self, stream_config, seconds):
+        """Record how long a link stayed valid (token lifetime or time until it died)"""
+        if seconds and seconds > 0:
+            source = self.get(stream_config)
+            source['lifetime'] = ewma(source['lifetime'], seconds)
+
+    def backoff_delay(self, stream_config):
+        """Exponential delay after consecutive failures, capped at HISTORY_MAX_BACKOFF"""
+        failures = self.get(stream_config)['failures']
+        if not failures:
+            return 0
+        return min(config.DAEMON_RETRY_DELAY * 2 ** (failures - 1), config.HISTORY_MAX_BACKOFF)
+
+    def in_backoff(self, stream_config, now=None):
+        return self.get(stream_config)['retry_at'] > (now or time.time())
+
+    def refresh_interval(self, stream_config, default):
+        """How long a fresh link can be trusted: most of its learned lifetime, else default"""
+        lifetime = self.get(stream_config)['lifetime']
+        if lifetime is None:
+            return default
+        return max(config.DAEMON_MIN_INTERVAL, min(default, lifetime * 0.8))
+
+    def wait_budget(self, stream_config, strategy):
+        """(initial_wait, timeout) for a strategy on this source.
+
+        Once a source has succeeded twice, waits are sized from its usual
+        time-to-first-playlist, never above the strategy's own limits.
+        """
+        source = self.get(stream_config)
+        if source['successes'] < 2 or source['time_to_first'] is None:
+            return strategy.initial_wait, strategy.timeout
+        expected = source['time_to_first']
+        timeout = min(strategy.timeout, max(config.HISTORY_MIN_WAIT, expected * 3 + config.CAPTURE_SETTLE))
+        initial_wait = min(strategy.initial_wait, max(1.0, expected))
+        return initial_wait, timeout
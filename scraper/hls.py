@@ -0,0 +1,168 @@
+"""
+HLS playlist parsing - master/media playlists, variant selection and conditional-GET caching
+"""
+import re
+import threading
+from urllib.parse import urljoin
+
+import requests
+
+from . import config
+from .metrics import metrics
+
+ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+def _number(text, kind=float):
+    """Numeric tag value, or None if a third-party packager wrote something unparseable"""
+    try:
+        return kind(text)
+    except (TypeError, ValueError):
+        pass
+    try:
+        # BANDWIDTH=1.5e6 and similar
+        return kind(float(text))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def parse_attributes(text):
+    """Attribute list of a tag (BANDWIDTH=1280000,RESOLUTION=1280x720,CODECS="...")"""
+    return {key: value.strip('"') for key, value in ATTRIBUTE.findall(text)}
+
+
+class Variant:
+    """One #EXT-X-STREAM-INF entry of a master playlist"""
+
+    __slots__ = ('uri', 'bandwidth', 'resolution', 'codecs')
+
+    def __init__(self, uri, attributes):
+        self.uri = uri
+        self.bandwidth = _number(attributes.get('BANDWIDTH', 0), int) or 0
+        self.codecs = attributes.get('CODECS', '')
+        width, _, height = attributes.get('RESOLUTION', '').partition('x')
+        self.resolution = (int(width), int(height)) if width.isdigit() and height.isdigit() else None
+
+
+class Playlist:
+    """A parsed master or media playlist; URIs are resolved against its URL"""
+
+    def __init__(self, url):
+        self.url = url
+        self.variants = []
+        self.segments = []
+        self.media_sequence = None
+        self.target_duration = None
+        self.endlist = False
+
+    @property
+    def is_master(self):
+        return bool(self.variants)
+
+    @property
+    def is_live(self):
+        return not self.is_master and not self.endlist
+
+    def best_variant(self):
+        """Highest bandwidth variant, resolution breaking ties"""
+        if not self.variants:
+            return None
+        return max(self.variants, key=lambda v: (v.bandwidth, v.resolution or (0, 0)))
+
+
+def parse_playlist(text, url):
+    """Parse playlist text fetched from url; returns None if it is not HLS"""
+    lines = [line.strip() for line in text.lstrip('﻿ \t\r\n').splitlines()]
+    if not lines or lines[0] != '#EXTM3U':
+        return None
+
+    playlist = Playlist(url)
+    stream_inf = None
+    for line in lines[1:]:
+        if not line:
+            continue
+        if line.startswith('#EXT-X-STREAM-INF:'):
+            stream_inf = parse_attributes(line.split(':', 1)[1])
+        elif line.startswith('#EXT-X-MEDIA-SEQUENCE:'):
+            playlist.media_sequence = _number(line.split(':', 1)[1] or 0, int)
+        elif line.startswith('#EXT-X-TARGETDURATION:'):
+            playlist.target_duration = _number(line.split(':', 1)[1] or 0)
+        elif line.startswith('#EXT-X-ENDLIST'):
+            playlist.endlist = True
+        elif line.startswith('#'):
+            continue
+        elif stream_inf is not None:
+            playlist.variants.append(Variant(urljoin(url, line), stream_inf))
+            stream_inf = None
+        else:
+            playlist.segments.append(urljoin(url, line))
+    return playlist
+
+
+class PlaylistFetcher:
+    """Fetches and parses playlists, revalidating cached copies with ETag/Last-Modified"""
+
+    def __init__(self, session=None, timeout=config.PROBE_TIMEOUT, max_entries=256):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.cache = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url, headers=None):
+        """Parsed playlist for url, or None if it cannot be fetched or is not HLS.
+
+        A 304 answer to a conditional request returns the cached parse.
+        """
+        headers = {k: v for k, v in (headers or {}).items() if v}
+        with self._lock:
+            cached = self.cache.get(url)
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        metrics.count('playlist_bytes', len(response.content))
+        if response.status_code == 304 and cached:
+            metrics.count('playlist_not_modified')
+            return cached['playlist']
+        if response.status_code != 200:
+            return None
+
+        playlist = parse_playlist(response.text, response.url)
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if playlist and (etag or last_modified):
+            with self._lock:
+                if len(self.cache) >= self.max_entries:
+                    self.cache.pop(next(iter(self.cache)))
+                self.cache[url] = {'etag': etag, 'last_modified': last_modified, 'playlist': playlist}
+        return playlist
+
+    def select(self, candidates, prefer=config.HLS_PUBLISH):
+        """Choose the link to publish from captured (link, headers, body) candidates.
+
+        Candidates are parsed in the order given, from their captured body when
+        there is one, else fetched. The first master playlist is
+        published as is (prefer='master') or as its best variant (prefer='best');
+        otherwise the first live media playlist wins. Returns (link, headers,
+        playlist), or None if no candidate is usable HLS.
+        """
+        media = None
+        for link, headers, body in candidates:
+            playlist = parse_playlist(body, link) if body else None
+            if not playlist:
+                playlist = self.fetch(link, headers)
+            if not playlist:
+                continue
+            if playlist.is_master:
+                if prefer == 'best':
+                    return playlist.best_variant().uri, headers, playlist
+                return link, headers, playlist
+            if media is None and playlist.is_live:
+                media = (link, headers, playlist)
+        return media
@@ -0,0 +1,135 @@
+"""
+Interaction planner - ranks frames by player signals and plays the best ones concurrently
+"""
+import asyncio
+import math
+
+from . import config
+from .log import log
+from .metrics import metrics
+from .routing import is_blocked_domain
+
+# What a frame looks like from the inside: size, visibility, video elements, player globals
+# and play controls
+FRAME_SIGNALS_SCRIPT = """
+    () => {
+        const area = el => { const r = el.getBoundingClientRect(); return r.width * r.height; };
+        const videos = Array.from(document.querySelectorAll('video'));
+        const players = ['videojs', 'jwplayer', 'Hls', 'Clappr', 'shaka', 'flowplayer', 'Plyr']
+            .filter(name => window[name] !== undefined);
+        const controls = document.querySelectorAll(
+            '.vjs-big-play-button, .jw-display-icon-container, [class*="play"], [aria-label*="play" i]');
+        return {
+            width: window.innerWidth,
+            height: window.innerHeight,
+            hidden: document.visibilityState === 'hidden',
+            videos: videos.length,
+            video_area: videos.reduce((sum, v) => sum + area(v), 0),
+            players: players,
+            controls: controls.length
+        };
+    }
+"""
+
+# Controls tried in a frame, most specific first; the first visible match is clicked
+PLAY_CONTROLS = [
+    '.vjs-big-play-button',
+    '.jw-display-icon-container',
+    'button[aria-label*="play" i]',
+    '.play-button',
+    'button.play',
+    '[class*="play"]',
+    'video'
+]
+
+# Play every video in the frame
+PLAY_VIDEOS_SCRIPT = """
+    () => document.querySelectorAll('video').forEach(v => {
+        v.muted = true;
+        v.play().catch(() => {});
+    })
+"""
+
+
+def score_frame(url, signals, main=False):
+    """Higher is more likely to hold the player; frames scoring 0 or less are skipped"""
+    if is_blocked_domain(url):
+        return 0
+    if signals['hidden'] or signals['width'] * signals['height'] < 100 * 100:
+        return 0
+    score = 50 * min(signals['videos'], 2) + 30 * len(signals['players'])
+    score += 10 * min(signals['controls'], 3)
+    score += math.log10(1 + signals['video_area'])
+    if any(k in url.lower() for k in config.PLAYER_URL_HINTS):
+        score += 15
+    # Size breaks ties between otherwise empty frames; the main page rarely holds the player
+    score += math.log10(signals['width'] * signals['height'])
+    return score - (5 if main else 0)
+
+
+async def _signals(frame):
+    try:
+        return await frame.evaluate(FRAME_SIGNALS_SCRIPT)
+    except Exception:
+        # Detached, navigating or cross-origin frame that went away
+        return None
+
+
+async def rank_frames(page, stream_config):
+    """Frames worth interacting with, best first, as (score, frame) pairs"""
+    frames = page.frames
+    with metrics.span('frame_discovery', stream_config['name']):
+        signals = await asyncio.gather(*(_signals(f) for f in frames))
+    ranked = []
+    for frame, s in zip(frames, signals):
+        score = score_frame(frame.url, s, frame == page.main_frame) if s else 0
+        if score > 0:
+            ranked.append((score, frame))
+    ranked.sort(key=lambda r: r[0], reverse=True)
+    return ranked
+
+
+async def play_frame(frame, capture, stream_config, click_timeout=1000):
+    """Click the most specific visible play control in the frame, then play its videos"""
+    for selector in PLAY_CONTROLS:
+        if capture.found:
+            return
+        try:
+            element = await frame.query_selector(selector)
+            if element and await element.is_visible():
+                await element.click(timeout=click_timeout)
+                log(stream_config, f"Clicked {selector} in {frame.url[:60]}")
+                break
+        except Exception:
+            continue
+    try:
+        await frame.evaluate(PLAY_VIDEOS_SCRIPT)
+    except Exception:
+        pass
+
+
+async def interact_ranked(page, capture, stream_config, top=config.INTERACT_FRAMES):
+    """Play the `top` best-ranked frames concurrently, stopping once a playlist is captured.
+
+    Returns the number of frames interacted with.
+    """
+    ranked = (await rank_frames(page, stream_config))[:top]
+    if not ranked:
+        log(stream_config, "No player-like frame found, waiting for auto-play...")
+        return 0
+    log(stream_config, "Interacting with " + ", ".join(
+        f"{frame.url[:50]} ({score:.0f})" for score, frame in ranked))
+
+    tasks = {asyncio.ensure_future(play_frame(frame, capture, stream_config)) for _, frame in ranked}
+    found = asyncio.ensure_future(capture.wait(None, settle=0))
+    try:
+        pending = set(tasks)
+        while pending and not found.done():
+            _, pending = await asyncio.wait(pending | {found}, return_when=asyncio.FIRST_COMPLETED)
+            pending.discard(found)
+    finally:
+        found.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return len(ranked)
@@ -0,0 +1,27 @@
+"""
+JSON state files - tolerant loading and atomic saving for the cache, history and writer state
+"""
+import json
+import os
+
+
+def load_json(path, what):
+    """Contents of a JSON state file, or None if there is no path, no file or it is unreadable"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable {what} {path}: {e}")
+        return None
+
+
+def save_json_atomic(path, data):
+    """Write data through a temp file and rename it, so readers never see half a file"""
+    if not path:
+        return
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
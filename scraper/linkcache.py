@@ -0,0 +1,87 @@
+"""
+Link cache - remembers the last good link per stream and skips the browser while it is valid
+"""
+import re
+import time
+from urllib.parse import parse_qsl, urlparse
+
+from . import config
+from .jsonfile import load_json, save_json_atomic
+
+# Query parameters that carry a unix expiry timestamp
+EXPIRY_PARAMS = ('expires', 'expire', 'expiry', 'exp', 'e', 'valid_until', 'validto')
+# Akamai-style tokens embed it as exp=<ts> inside another parameter (hdnts, __token__)
+EMBEDDED_EXPIRY = re.compile(r'(?:^|[~&])exp=(\d{9,13})')
+
+
+def _to_seconds(value):
+    value = int(value)
+    return value / 1000 if value > 10 ** 12 else value
+
+
+def parse_expiry(url):
+    """Expiry of a tokenized link as a unix timestamp, or None if it has none"""
+    for key, value in parse_qsl(urlparse(url).query, keep_blank_values=True):
+        if key.lower() in EXPIRY_PARAMS and value.isdigit() and len(value) >= 9:
+            return _to_seconds(value)
+        match = EMBEDDED_EXPIRY.search(value)
+        if match:
+            return _to_seconds(match.group(1))
+    return None
+
+
+class LinkCache:
+    """Last good link and headers per stream, persisted to a JSON file"""
+
+    def __init__(self, path=config.LINK_CACHE_FILE, refresh_margin=config.LINK_REFRESH_MARGIN,
+                 default_ttl=config.LINK_DEFAULT_TTL):
+        self.path = path
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        self.entries = load_json(self.path, 'link cache') or {}
+
+    def save(self):
+        save_json_atomic(self.path, self.entries)
+
+    def remaining(self, stream_config, now=None):
+        """Seconds of lifetime left on the cached link, or None if nothing is cached"""
+        entry = self.entries.get(stream_config['url'])
+        if not entry:
+            return None
+        expires = entry['expires']
+        if expires is None:
+            expires = entry['stored_at'] + self.default_ttl
+        return expires - (now or time.time())
+
+    def get(self, stream_config, now=None):
+        """Cached result if the link outlives the refresh margin, else None"""
+        remaining = self.remaining(stream_config, now)
+        if remaining is None or remaining <= self.refresh_margin:
+            return None
+        return self.entries[stream_config['url']]['result']
+
+    def probe_candidate(self, stream_config, now=None):
+        """Cached entry worth probing: its token is not about to expire, or it has none"""
+        entry = self.entries.get(stream_config['url'])
+        if not entry:
+            return None
+        if entry['expires'] is not None and entry['expires'] - (now or time.time()) <= self.refresh_margin:
+            return None
+        return entry
+
+    def put(self, stream_config, result, now=None):
+        """Remember a freshly scraped result"""
+        self.entries[stream_config['url']] = {
+            'link': result['link'],
+            'headers': result['headers'],
+            'expires': parse_expiry(result['link']),
+            'stored_at': now or time.time(),
+            'result': result
+        }
+
+    def invalidate(self, stream_config):
+        self.entries.pop(stream_config['url'], None)
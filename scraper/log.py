@@ -0,0 +1,8 @@
+"""
+Console output shared by the engine and strategies
+"""
+
+
+def log(stream_config, message):
+    """Print a line tagged with the stream name so concurrent output stays readable"""
+    print(f"   [{stream_config['name']}] {message}")
@@ -0,0 +1,136 @@
+"""
+Run metrics - timing spans per phase and counters, exported as JSON or Prometheus text
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from . import config
+
+
+class Metrics:
+    """Durations per phase (browser launch, navigation, capture wait, ...) and counters.
+
+    Spans may carry the stream name so the report can show where each stream
+    spent its time. Values accumulate until reset(), so in daemon mode the
+    Prometheus output behaves like cumulative summaries and counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Callables told (phase, started) at each span boundary; used by the profiler
+        self.listeners = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.phases = {}
+            self.streams = {}
+            self.counters = {}
+            self.tiers = {}
+            self.open = {}
+
+    def open_phases(self):
+        """Phases with at least one span in progress right now"""
+        with self._lock:
+            return [phase for phase, n in self.open.items() if n]
+
+    def observe(self, phase, seconds, stream=None):
+        with self._lock:
+            summary = self.phases.setdefault(phase, {'count': 0, 'total': 0.0, 'max': 0.0})
+            summary['count'] += 1
+            summary['total'] += seconds
+            summary['max'] = max(summary['max'], seconds)
+            if stream:
+                totals = self.streams.setdefault(stream, {})
+                totals[phase] = totals.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def span(self, phase, stream=None):
+        """Time the enclosed block (sync or async code) as one occurrence of phase"""
+        with self._lock:
+            self.open[phase] = self.open.get(phase, 0) + 1
+        for listener in self.listeners:
+            listener(phase, True)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.open[phase] = self.open.get(phase, 1) - 1
+            self.observe(phase, time.perf_counter() - started, stream)
+            for listener in self.listeners:
+                listener(phase, False)
+
+    def set_tier(self, stream, tier):
+        """How the stream's link was obtained last: a cascade tier, 'static', 'cache', 'probe',
+        'backoff', or None if nothing was found"""
+        with self._lock:
+            self.tiers[stream] = tier
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        """Everything recorded so far as a JSON-serialisable dict"""
+        with self._lock:
+            phases = {
+                phase: {'count': s['count'], 'total': round(s['total'], 3),
+                        'avg': round(s['total'] / s['count'], 3), 'max': round(s['max'], 3)}
+                for phase, s in sorted(self.phases.items(), key=lambda p: -p[1]['total'])
+            }
+            streams = {name: {phase: round(t, 3) for phase, t in totals.items()}
+                       for name, totals in self.streams.items()}
+            return {
+                'started': self.started,
+                'elapsed': round(time.time() - self.started, 3),
+                'phases': phases,
+                'streams': streams,
+                'tiers': dict(self.tiers),
+                'counters': dict(self.counters)
+            }
+
+    def prometheus(self, prefix='scraper'):
+        """Prometheus text exposition format (phase summaries and counters)"""
+        report = self.report()
+        lines = [f"# HELP {prefix}_phase_seconds Time spent per scrape phase",
+                 f"# TYPE {prefix}_phase_seconds summary"]
+        for phase, s in report['phases'].items():
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {s["total"]}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{phase}"}} {s["count"]}')
+        if report['tiers']:
+            lines.append(f"# HELP {prefix}_stream_tier How each stream's link was obtained last")
+            lines.append(f"# TYPE {prefix}_stream_tier gauge")
+            for stream, tier in sorted(report['tiers'].items()):
+                lines.append(f'{prefix}_stream_tier{{stream="{stream}",tier="{tier or "none"}"}} 1')
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path=config.METRICS_FILE, prometheus_path=config.METRICS_PROM_FILE):
+        """Write the JSON report and, if a path is set, the Prometheus text file"""
+        if path:
+            with open(path, 'w') as f:
+                json.dump(self.report(), f, indent=2)
+        if prometheus_path:
+            tmp = prometheus_path + '.tmp'
+            with open(tmp, 'w') as f:
+                f.write(self.prometheus())
+            # Atomic replace, so a textfile collector never reads half a file
+            os.replace(tmp, prometheus_path)
+
+
+# Metrics of the current process, shared by every module
+metrics = Metrics()
+
+
+def print_phases(report):
+    """Time per phase, largest first"""
+    print("\nTime per phase:")
+    for phase, s in report['phases'].items():
+        print(f"   {phase:<16} {s['total']:7.1f}s total  {s['avg']:6.2f}s avg  x{s['count']}")
@@ -0,0 +1,135 @@
+"""
+Local mirror of Firebase RTDB state kept up to date by the REST streaming (SSE) endpoint
+"""
+import copy
+import json
+import threading
+
+import requests
+
+from . import config
+
+
+def parse_sse(lines):
+    """Yield (event, data) pairs from an iterable of text/event-stream lines"""
+    event, data = None, []
+    for line in lines:
+        if line is None:
+            continue
+        if not line:
+            if event is not None or data:
+                yield event, '\n'.join(data)
+            event, data = None, []
+        elif line.startswith(':'):
+            continue
+        elif line.startswith('event:'):
+            event = line[6:].strip()
+        elif line.startswith('data:'):
+            data.append(line[5:].lstrip())
+
+
+def _segments(path):
+    return [p for p in path.split('/') if p]
+
+
+class RtdbMirror:
+    """In-memory copy of an RTDB path that applies streamed put/patch events.
+
+    The stream runs in a daemon thread and reconnects after errors. Lookups are
+    local and never hit the network; `ready` is set after the first full put.
+    """
+
+    def __init__(self, base_url=None, auth=None, path='', reconnect_delay=config.MIRROR_RECONNECT_DELAY,
+                 session=None):
+        self.base_url = (base_url or config.FIREBASE_URL).rstrip('/')
+        self.auth = config.FIREBASE_AUTH if auth is None else auth
+        self.path = path.strip('/')
+        self.reconnect_delay = reconnect_delay
+        self.session = session or requests.Session()
+        self.tree = None
+        self.ready = threading.Event()
+        self.events = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def url(self):
+        url = f"{self.base_url}/{self.path}.json" if self.path else f"{self.base_url}/.json"
+        if self.auth:
+            url += f"?auth={self.auth}"
+        return url
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='rtdb-mirror', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop after the next event or keep-alive; the daemon thread never blocks exit"""
+        self._stop.set()
+
+    def wait_ready(self, timeout=config.MIRROR_READY_TIMEOUT):
+        return self.ready.wait(timeout)
+
+    def get(self, path=''):
+        """Value at path (relative to the mirrored path), or None"""
+        with self._lock:
+            node = self.tree
+            for key in _segments(path):
+                if not isinstance(node, dict):
+                    return None
+                node = node.get(key)
+            return copy.deepcopy(node)
+
+    def _set(self, path, value):
+        keys = _segments(path)
+        if not keys:
+            self.tree = value
+            return
+        if not isinstance(self.tree, dict):
+            self.tree = {}
+        node = self.tree
+        for key in keys[:-1]:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        if value is None:
+            node.pop(keys[-1], None)
+        else:
+            node[keys[-1]] = value
+
+    def apply(self, event, payload):
+        """Apply one 'put' or 'patch' event payload ({"path": ..., "data": ...})"""
+        path, data = payload['path'], payload['data']
+        with self._lock:
+            if event == 'put':
+                self._set(path, data)
+            elif event == 'patch':
+                for key, value in (data or {}).items():
+                    self._set(f"{path}/{key}", value)
+            self.events += 1
+        if event == 'put' and not _segments(path):
+            self.ready.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with self.session.get(self.url(), headers={'Accept': 'text/event-stream'},
+                                      stream=True, timeout=(10, 90)) as response:
+                    response.raise_for_status()
+                    lines = response.iter_lines(chunk_size=None, decode_unicode=True)
+                    for event, data in parse_sse(lines):
+                        if self._stop.is_set():
+                            break
+                        if event in ('put', 'patch'):
+                            self.apply(event, json.loads(data))
+                        elif event == 'cancel':
+                            print(f"❌ Firebase mirror cancelled: {data}")
+                            self._stop.set()
+                            break
+                        elif event == 'auth_revoked':
+                            break
+            except (requests.RequestException, ValueError) as e:
+                if not self._stop.is_set():
+                    print(f"⚠️  Firebase mirror disconnected: {e}")
+            self._stop.wait(self.reconnect_delay)
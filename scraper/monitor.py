@@ -0,0 +1,143 @@
+"""
+Health monitor - re-probes every published link on an interval and flags dead ones
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import config
+from .linkcache import parse_expiry
+from .probe import probe_playlist
+
+
+class HealthMonitor:
+    """Probes the links currently published in Firebase, all of them concurrently.
+
+    Each cycle reads the published record of every stream (from the writer's
+    state or mirror), probes it with its stored headers and compares the media
+    sequence with the previous cycle. A link that answers 4xx, has stalled or
+    ended, or whose token has expired is marked DOWN with a small status PATCH
+    and handed to `on_down(idx, reason)`, which queues a re-scrape. Transport
+    errors and 5xx answers may be a blip on our side, so they only count after
+    `failures` cycles in a row.
+
+    Probes are blocking requests calls run on a dedicated thread pool of
+    `concurrency` workers sharing one keep-alive session; the event loop only
+    waits on them, so a cycle over hundreds of links stays on one core.
+    """
+
+    def __init__(self, stream_configs, writer, on_down=None, interval=config.MONITOR_INTERVAL,
+                 concurrency=config.MONITOR_CONCURRENCY, timeout=config.PROBE_TIMEOUT,
+                 failures=config.MONITOR_FAILURES):
+        self.stream_configs = stream_configs
+        self.writer = writer
+        self.on_down = on_down
+        self.interval = interval
+        self.timeout = timeout
+        self.failures = max(1, failures)
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='monitor')
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.previous = {}
+        self.cycles = 0
+
+    def published(self):
+        """(idx, server_key, record) for every stream with a live published link"""
+        for idx, stream_config in enumerate(self.stream_configs):
+            key = config.server_key(idx)
+            record = self.writer.current(key)
+            if not record or not record.get('link') or record.get('status') != 'OK':
+                continue
+            if record.get('source_url') != stream_config['url']:
+                continue
+            yield idx, key, record
+
+    @staticmethod
+    def transient(probe):
+        """True for failures that may be on our side: no answer at all, or a 5xx"""
+        return not probe['ok'] and (probe['reason'].startswith('request failed')
+                                    or (probe['status'] or 0) >= 500)
+
+    def check(self, key, record, now=None):
+        """Probe one record; returns the probe result (with 'reason' on failure).
+
+        Transient failures carry 'failures', the count of them in a row; the last
+        good probe is kept for the next media sequence comparison.
+        """
+        expires = parse_expiry(record['link'])
+        if expires is not None and expires <= (now or time.time()):
+            return {'ok': False, 'reason': 'token expired', 'media_sequence': None,
+                    'status': None, 'checked_at': time.time()}
+        previous = self.previous.get(key)
+        if previous and previous['link'] != record['link']:
+            previous = None
+        last = previous and previous['probe']
+        probe = probe_playlist(record['link'], record.get('headers'), last, self.timeout, self.session)
+        if self.transient(probe):
+            probe['failures'] = (previous['failures'] if previous else 0) + 1
+            self.previous[key] = {'link': record['link'], 'probe': last, 'failures': probe['failures']}
+        else:
+            self.previous[key] = {'link': record['link'], 'probe': probe, 'failures': 0}
+        return probe
+
+    async def cycle(self):
+        """Probe every published link once; returns {server_key: probe} for the links checked"""
+        loop = asyncio.get_running_loop()
+        targets = list(self.published())
+        probes = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, self.check, key, record)
+            for _, key, record in targets), return_exceptions=True)
+
+        results, down = {}, []
+        for (idx, key, record), probe in zip(targets, probes):
+            name = self.stream_configs[idx]['name']
+            if isinstance(probe, Exception):
+                print(f"   [{name}] ⚠️  Health check error: {probe}")
+                continue
+            results[key] = probe
+            if probe['ok']:
+                continue
+            if self.transient(probe) and probe['failures'] < self.failures:
+                print(f"   [{name}] ⚠️  Probe failed ({probe['reason']}), "
+                      f"{probe['failures']}/{self.failures} before marking down")
+                continue
+            down.append(idx)
+            self.writer.mark(key, 'DOWN', probe['reason'], int(probe['checked_at'] * 1000))
+            self.previous.pop(key, None)
+            print(f"   [{name}] ❌ Published link down: {probe['reason']}")
+
+        self.cycles += 1
+        live = sum(1 for p in results.values() if p['ok'])
+        print(f"Health check: {live}/{len(targets)} published link(s) live, {len(down)} marked down")
+        if down:
+            await asyncio.to_thread(self.writer.flush)
+            for idx in down:
+                if self.on_down:
+                    self.on_down(idx, results[config.server_key(idx)]['reason'])
+        return results
+
+    async def run(self, stop):
+        """Run cycles every `interval` seconds until the `stop` event is set"""
+        try:
+            while not stop.is_set():
+                started = time.time()
+                try:
+                    await self.cycle()
+                except Exception as e:
+                    print(f"⚠️  Health check failed: {e}")
+                try:
+                    await asyncio.wait_for(stop.wait(), max(0, self.interval - (time.time() - started)))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,52 @@
+"""
+Page navigation that does not wait for networkidle on live-video pages
+"""
+import asyncio
+import time
+
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+from . import config
+
+NAVIGATION_MODES = ('commit', 'domcontentloaded', 'load', 'networkidle')
+
+
+def navigation_settings(stream_config, default_mode=None):
+    """Navigation mode and timeout for a stream; per-source keys override the defaults"""
+    mode = stream_config.get('navigation', default_mode or config.NAVIGATION_MODE)
+    if mode not in NAVIGATION_MODES:
+        raise ValueError(f"Unknown navigation mode: {mode}")
+    timeout = float(stream_config.get('navigation_timeout', config.NAVIGATION_TIMEOUT))
+    return mode, timeout
+
+
+def _consume(task):
+    """Retrieve the result of a goto we stopped waiting for"""
+    if not task.cancelled():
+        task.exception()
+
+
+async def navigate(page, url, capture, mode, timeout):
+    """Load url, finishing early if a playlist is captured first.
+
+    Returns a timing record: mode, elapsed seconds and outcome
+    ('loaded', 'playlist' or 'timeout').
+    """
+    started = time.time()
+    goto = asyncio.ensure_future(page.goto(url, wait_until=mode, timeout=timeout * 1000))
+    found = asyncio.ensure_future(capture.wait(None, settle=0))
+
+    done, _ = await asyncio.wait({goto, found}, return_when=asyncio.FIRST_COMPLETED)
+    found.cancel()
+
+    if goto in done:
+        try:
+            goto.result()
+            outcome = 'loaded'
+        except PlaywrightTimeout:
+            outcome = 'timeout'
+    else:
+        goto.add_done_callback(_consume)
+        outcome = 'playlist'
+
+    return {'mode': mode, 'elapsed': round(time.time() - started, 3), 'outcome': outcome}
@@ -0,0 +1,118 @@
+"""
+Browser pool - keeps warm Chromium instances and hands out a fresh context per stream
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from . import config
+from .metrics import metrics
+
+
+class PooledBrowser:
+    """A launched browser plus its usage counters"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.uses = 0
+        self.active = 0
+        self.retired = False
+        browser.on('disconnected', lambda _: self.retire())
+
+    def retire(self):
+        self.retired = True
+
+    @property
+    def usable(self):
+        return not self.retired and self.browser.is_connected()
+
+
+class BrowserPool:
+    """Hands out BrowserContexts from up to `size` warm browsers.
+
+    A browser is retired after `max_uses` contexts or when it disconnects, and is
+    closed once its last context is released.
+    """
+
+    def __init__(self, playwright, size=config.BROWSER_POOL_SIZE,
+                 max_uses=config.BROWSER_MAX_USES, args=None):
+        self.playwright = playwright
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.args = args if args is not None else config.BROWSER_ARGS
+        self.launches = 0
+        self._browsers = []
+        self._lock = asyncio.Lock()
+
+    async def _launch(self):
+        with metrics.span('browser_launch'):
+            browser = await self.playwright.chromium.launch(headless=True, args=self.args)
+        self.launches += 1
+        metrics.count('browser_launches')
+        return PooledBrowser(browser)
+
+    async def _acquire(self):
+        """Pick an idle browser, launch one if below size, else share the least busy"""
+        async with self._lock:
+            usable = [b for b in self._browsers if b.usable]
+            idle = [b for b in usable if b.active == 0]
+            if idle:
+                pooled = idle[0]
+            elif len(usable) < self.size:
+                pooled = await self._launch()
+                self._browsers.append(pooled)
+            else:
+                pooled = min(usable, key=lambda b: b.active)
+
+            pooled.uses += 1
+            pooled.active += 1
+            if pooled.uses >= self.max_uses:
+                pooled.retire()
+            return pooled
+
+    async def _release(self, pooled):
+        async with self._lock:
+            pooled.active -= 1
+            if pooled.active == 0 and not pooled.usable:
+                self._browsers.remove(pooled)
+                try:
+                    await pooled.browser.close()
+                except Exception:
+                    pass
+
+    @asynccontextmanager
+    async def context(self, **options):
+        """Yield a fresh BrowserContext; retries once on a crashed browser"""
+        options.setdefault('user_agent', config.USER_AGENT)
+        options.setdefault('viewport', config.VIEWPORT)
+        options.setdefault('ignore_https_errors', True)
+
+        for attempt in range(2):
+            pooled = await self._acquire()
+            try:
+                with metrics.span('context_create'):
+                    context = await pooled.browser.new_context(**options)
+                break
+            except Exception:
+                pooled.retire()
+                await self._release(pooled)
+                if attempt:
+                    raise
+
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pooled.retire()
+            await self._release(pooled)
+
+    async def close(self):
+        """Close every browser in the pool"""
+        async with self._lock:
+            for pooled in self._browsers:
+                try:
+                    await pooled.browser.close()
+                except Exception:
+                    pass
+            self._browsers = []
@@ -0,0 +1,56 @@
+"""
+HTTP liveness probe - checks a published playlist without launching a browser
+"""
+import time
+
+import requests
+
+from . import config
+from .hls import parse_playlist
+from .metrics import metrics
+
+
+def _result(ok, reason, media_sequence=None, status=None):
+    return {'ok': ok, 'reason': reason, 'media_sequence': media_sequence,
+            'status': status, 'checked_at': time.time()}
+
+
+def probe_playlist(link, headers, previous=None, timeout=config.PROBE_TIMEOUT, session=None):
+    """Fetch a playlist with its stored headers and check that it is live HLS.
+
+    Master playlists are followed to their best variant. With `previous` (the
+    result of an earlier probe) the media sequence must have moved on once more
+    than two target durations have passed.
+    """
+    http = session or requests
+    headers = {k: v for k, v in (headers or {}).items() if v}
+    url = link
+    for _ in range(2):
+        try:
+            response = http.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            return _result(False, f"request failed: {e}")
+        if response.status_code != 200:
+            return _result(False, f"HTTP {response.status_code}", status=response.status_code)
+        metrics.count('probe_bytes', len(response.content))
+        playlist = parse_playlist(response.text, response.url)
+        if not playlist:
+            return _result(False, 'not an HLS playlist', status=200)
+        if not playlist.is_master:
+            break
+        url = playlist.best_variant().uri
+    else:
+        return _result(False, 'no media playlist behind master', status=200)
+
+    if playlist.endlist:
+        return _result(False, 'playlist has ended', status=200)
+
+    sequence = playlist.media_sequence
+    target = playlist.target_duration or 10
+
+    if previous and previous.get('media_sequence') is not None and sequence is not None:
+        elapsed = time.time() - previous['checked_at']
+        if elapsed > 2 * target and sequence == previous['media_sequence']:
+            return _result(False, 'media sequence stalled', sequence, 200)
+
+    return _result(True, 'live', sequence, 200)
@@ -0,0 +1,102 @@
+"""
+Process memory sampling - RSS of this process and of the browser processes it started
+"""
+import asyncio
+import os
+import resource
+import sys
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _parents():
+    """{pid: ppid} for every process in /proc (empty where /proc does not exist)"""
+    parents = {}
+    try:
+        pids = [p for p in os.listdir('/proc') if p.isdigit()]
+    except OSError:
+        return parents
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses; fields resume after the last ')'
+        fields = stat[stat.rfind(')') + 2:].split()
+        parents[int(pid)] = int(fields[1])
+    return parents
+
+
+def descendants(pid):
+    """PIDs of all processes below pid (the playwright driver, Chromium and its helpers)"""
+    children = {}
+    for child, parent in _parents().items():
+        children.setdefault(parent, []).append(child)
+    found, stack = [], list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        found.append(child)
+        stack.extend(children.get(child, []))
+    return found
+
+
+def rss(pid):
+    """Resident set size of a process in bytes, or 0 if it is gone"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def children_rss(pid=None):
+    """Total RSS in bytes of every process below pid (default: this process)"""
+    return sum(rss(child) for child in descendants(pid or os.getpid()))
+
+
+def peak_rss_self():
+    """Peak RSS of this Python process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class RssSampler:
+    """Samples the RSS of the child process tree in the background while a block runs.
+
+        async with RssSampler() as sampler:
+            ...
+        sampler.peak, sampler.samples
+
+    On systems without /proc every sample is 0.
+    """
+
+    def __init__(self, interval=0.25, pid=None):
+        self.interval = interval
+        self.pid = pid or os.getpid()
+        self.peak = 0
+        self.samples = []
+        self._task = None
+
+    def sample(self):
+        value = children_rss(self.pid)
+        self.peak = max(self.peak, value)
+        self.samples.append(value)
+        return value
+
+    async def _run(self):
+        while True:
+            await asyncio.to_thread(self.sample)
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self.sample()
@@ -0,0 +1,268 @@
+"""
+Profiling mode (--profile) - cProfile, tracemalloc and browser RSS for one run
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from . import config
+from .metrics import metrics
+from .procmem import children_rss, peak_rss_self
+
+
+# Rows of the per-phase function and allocation tables
+PHASE_TOP = 10
+
+
+def _filtered(snapshot):
+    """Snapshot without the profiler's own and import machinery allocations"""
+    return snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, os.path.join(os.path.dirname(__file__), 'procmem.py')),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>')
+    ))
+
+
+def _where(filename, name=''):
+    """Short label for a function: our modules, playwright, asyncio, idle or other"""
+    if filename == '~' and 'poll' in name:
+        # The event loop's select/epoll call: waiting on the browser or the network
+        return 'idle'
+    package = os.path.dirname(os.path.abspath(__file__))
+    if filename.startswith(package):
+        return 'scraper'
+    if os.sep + 'playwright' + os.sep in filename:
+        return 'playwright'
+    if os.sep + 'asyncio' + os.sep in filename:
+        return 'asyncio'
+    return 'other'
+
+
+class Profiler:
+    """Profiles a run: Python CPU (cProfile), Python allocations (tracemalloc) and the
+    RSS of the browser processes, sampled every `interval` seconds.
+
+    Samples are attributed to the metrics phases open at that moment, giving
+    peak browser and Python memory per phase. At each phase boundary the active
+    cProfile profiler is switched, so CPU goes to the innermost open phase
+    (time outside any phase stays on the run-wide profiler), and a tracemalloc
+    snapshot is compared with the one taken when the phase opened. Phases of
+    concurrent streams interleave, so per-phase tables are only clean with
+    --concurrency 1. cProfile only sees the event loop thread, which is where
+    playwright event callbacks and route handlers run; work sent to threads
+    (probes, Firebase writes) shows up as waits.
+    """
+
+    def __init__(self, interval=config.PROFILE_INTERVAL, top=config.PROFILE_TOP):
+        self.interval = interval
+        self.top = top
+        self.profile = cProfile.Profile()
+        self.phase_profiles = {}
+        self.phase_allocations = {}
+        self.phases = {}
+        self._open = []
+        self._thread_id = None
+        self.browser_peak = 0
+        self.browser_samples = []
+        self.started = None
+        self.elapsed = None
+        self.snapshot = None
+        self._snapshot_size = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        tracemalloc.start(config.PROFILE_TRACE_FRAMES)
+        self.started = time.time()
+        self._thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._thread.start()
+        metrics.listeners.append(self.on_phase)
+        self.profile.enable()
+        return self
+
+    def stop(self):
+        self._active().disable()
+        metrics.listeners.remove(self.on_phase)
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.time() - self.started
+        self.sample()
+        self.python_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    def sample(self):
+        browser = children_rss()
+        python = tracemalloc.get_traced_memory()[0]
+        if python > self._snapshot_size * 1.1:
+            # Keep allocation sites from near the high-water mark, not from the end of the run
+            self.snapshot = tracemalloc.take_snapshot()
+            self._snapshot_size = python
+        self.browser_peak = max(self.browser_peak, browser)
+        self.browser_samples.append((round(time.time() - self.started, 2), browser))
+        for phase in metrics.open_phases():
+            peaks = self.phases.setdefault(phase, {'samples': 0, 'browser_peak': 0, 'python_peak': 0})
+            peaks['samples'] += 1
+            peaks['browser_peak'] = max(peaks['browser_peak'], browser)
+            peaks['python_peak'] = max(peaks['python_peak'], python)
+
+    def _active(self):
+        """Profiler collecting right now: the innermost open phase's, else the run-wide one"""
+        return self.phase_profiles[self._open[-1][0]] if self._open else self.profile
+
+    def on_phase(self, phase, started):
+        """Metrics span boundary: switch profilers and diff allocations over the phase"""
+        if threading.get_ident() != self._thread_id:
+            return
+        self._active().disable()
+        if started:
+            self.phase_profiles.setdefault(phase, cProfile.Profile())
+            self._open.append((phase, tracemalloc.take_snapshot()))
+        else:
+            for i in range(len(self._open) - 1, -1, -1):
+                if self._open[i][0] == phase:
+                    _, before = self._open.pop(i)
+                    self._add_allocations(phase, before)
+                    break
+        self._active().enable()
+
+    def _add_allocations(self, phase, before):
+        sites = self.phase_allocations.setdefault(phase, {})
+        for stat in _filtered(tracemalloc.take_snapshot()).compare_to(_filtered(before), 'lineno'):
+            if stat.size_diff > 0:
+                site = sites.setdefault(str(stat.traceback[0]), [0, 0])
+                site[0] += stat.size_diff
+                site[1] += max(stat.count_diff, 0)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def _stats(self, phase=None):
+        """pstats for one phase, or for the whole run (every profiler combined)"""
+        if phase:
+            profiles = [self.phase_profiles[phase]]
+        else:
+            profiles = [self.profile] + list(self.phase_profiles.values())
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def top_functions(self, sort, phase=None, top=None):
+        stats = self._stats(phase)
+        stats.sort_stats(sort)
+        rows = []
+        # The profiler's own phase switching is left out
+        functions = [f for f in stats.fcn_list if f[0] != __file__]
+        for func in functions[:top or self.top]:
+            calls, primitive, tottime, cumtime, _ = stats.stats[func]
+            filename, line, name = func
+            rows.append({'function': f"{os.path.basename(filename)}:{line}({name})",
+                         'where': _where(filename, name), 'calls': calls,
+                         'tottime': round(tottime, 4), 'cumtime': round(cumtime, 4)})
+        return rows
+
+    def cpu_by_package(self):
+        """Own CPU time summed for our code, playwright, asyncio and everything else"""
+        totals = {}
+        for (filename, _, name), (_, calls, tottime, _, _) in self._stats().stats.items():
+            entry = totals.setdefault(_where(filename, name), {'calls': 0, 'tottime': 0.0})
+            entry['calls'] += calls
+            entry['tottime'] += tottime
+        return {k: {'calls': v['calls'], 'tottime': round(v['tottime'], 3)} for k, v in totals.items()}
+
+    def allocation_sites(self, phase=None, top=None):
+        """Largest allocation sites near the run's peak, or grown over a phase"""
+        if phase:
+            sites = sorted(self.phase_allocations.get(phase, {}).items(), key=lambda s: -s[1][0])
+            return [{'site': site, 'size': size, 'count': count}
+                    for site, (size, count) in sites[:top or self.top]]
+        if not self.snapshot:
+            return []
+        return [{'site': str(stat.traceback[0]), 'size': stat.size, 'count': stat.count}
+                for stat in _filtered(self.snapshot).statistics('lineno')[:top or self.top]]
+
+    def report(self):
+        phase_times = metrics.report()['phases']
+        phases = {}
+        for phase, timing in phase_times.items():
+            memory = self.phases.get(phase, {})
+            phases[phase] = dict(timing, browser_peak=memory.get('browser_peak', 0),
+                                 python_peak=memory.get('python_peak', 0))
+            if phase in self.phase_profiles:
+                phases[phase]['top_functions'] = self.top_functions('tottime', phase, PHASE_TOP)
+                phases[phase]['allocation_sites'] = self.allocation_sites(phase, PHASE_TOP)
+        return {
+            'elapsed': round(self.elapsed, 3),
+            'phases': phases,
+            'cpu_by_package': self.cpu_by_package(),
+            'top_functions_tottime': self.top_functions('tottime'),
+            'top_functions_cumtime': self.top_functions('cumulative'),
+            'allocation_sites': self.allocation_sites(),
+            'memory': {
+                'browser_peak': self.browser_peak,
+                'browser_samples': self.browser_samples,
+                'python_traced_peak': self.python_peak,
+                'python_rss_peak': peak_rss_self()
+            }
+        }
+
+    def save(self, path=config.PROFILE_FILE):
+        """Write the JSON report and the raw cProfile data (path with .pstats)"""
+        report = self.report()
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        self._stats().dump_stats(os.path.splitext(path)[0] + '.pstats')
+        return report
+
+
+def print_profile(report, path):
+    mib = 2 ** 20
+    print("\n" + "=" * 60)
+    print(f"Profile ({report['elapsed']:.1f}s)")
+    print("=" * 60)
+    memory = report['memory']
+    print(f"Browser RSS peak: {memory['browser_peak'] / mib:.0f} MiB, Python RSS peak: "
+          f"{memory['python_rss_peak'] / mib:.0f} MiB (traced {memory['python_traced_peak'] / mib:.1f} MiB)")
+    print("CPU in Python by package: " + ", ".join(
+        f"{k} {v['tottime']:.2f}s/{v['calls']} calls" for k, v in report['cpu_by_package'].items()))
+    print("Phases:")
+    for phase, p in report['phases'].items():
+        print(f"   {phase:<16} {p['total']:7.1f}s  browser {p['browser_peak'] / mib:6.0f} MiB  "
+              f"python {p['python_peak'] / mib:6.1f} MiB")
+    for phase, p in report['phases'].items():
+        if p.get('top_functions'):
+            hottest = p['top_functions'][0]
+            grown = p['allocation_sites'][0] if p['allocation_sites'] else None
+            print(f"   {phase:<16} hottest {hottest['function']} {hottest['tottime']:.3f}s"
+                  + (f", grew {grown['size'] / 1024:.0f} KiB at {grown['site']}" if grown else ""))
+    print("Top functions (own time):")
+    for row in report['top_functions_tottime'][:10]:
+        print(f"   {row['tottime']:8.3f}s {row['calls']:>8}  {row['function']}")
+    print("Top allocation sites:")
+    for row in report['allocation_sites'][:5]:
+        print(f"   {row['size'] / 1024:8.0f} KiB {row['count']:>7}  {row['site']}")
+    print(f"Profile saved to: {path}")
+
+
+@contextmanager
+def profiled(enabled, path=config.PROFILE_FILE):
+    """Profile the enclosed block if enabled, then write and print the report"""
+    if not enabled:
+        yield None
+        return
+    profiler = Profiler().start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        print_profile(profiler.save(path), path)
@@ -0,0 +1,60 @@
+"""
+Result records and the scrape_results.json report
+"""
+import json
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+from . import config
+
+RESULTS_FILE = 'scrape_results.json'
+
+
+def build_result(stream_config, link, headers):
+    """Build the record stored in Firebase for a captured link"""
+    now = int(time.time() * 1000)
+    return {
+        'source_url': stream_config['url'],
+        'title': stream_config['title'],
+        'name': stream_config['name'],
+        'link': link,
+        'headers': headers,
+        'status': 'OK',
+        'thumblink': stream_config.get('thumblink', ''),
+        'createdAt': now,
+        'createdAtISO': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'lastCheckedAt': now
+    }
+
+
+def origin(url):
+    """scheme://host[:port] of url, or '' for about:blank and the like"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else ''
+
+
+def implied_headers(frame_url, user_agent=config.USER_AGENT):
+    """Headers a player inside frame_url sends for a cross-origin playlist request.
+
+    Chromium's default strict-origin-when-cross-origin policy sends only the
+    origin as Referer.
+    """
+    frame_origin = origin(frame_url)
+    return {'Origin': frame_origin, 'Referer': frame_origin + '/', 'User-Agent': user_agent}
+
+
+def pick_headers(headers):
+    """Keep the headers a player needs, whatever their case"""
+    return {
+        'Origin': headers.get('origin', headers.get('Origin', '')),
+        'Referer': headers.get('referer', headers.get('Referer', '')),
+        'User-Agent': headers.get('user-agent', headers.get('User-Agent', ''))
+    }
+
+
+def save_results(results, path=RESULTS_FILE):
+    """Write successful results to scrape_results.json"""
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {path}")
@@ -0,0 +1,86 @@
+"""
+Request routing - aborts images, fonts, ads and repeated HLS segments
+"""
+from urllib.parse import urlparse
+
+from . import config
+from .capture import is_playlist, is_segment
+
+
+def matches_domain(host, domains):
+    """True if host is one of domains or a subdomain of one"""
+    return any(host == d or host.endswith('.' + d) for d in domains)
+
+
+def is_blocked_domain(url, domains=None):
+    """True if url is on an ad/tracker domain (config.BLOCK_DOMAINS by default)"""
+    host = (urlparse(url).hostname or '').lower()
+    return matches_domain(host, config.BLOCK_DOMAINS if domains is None else domains)
+
+
+class RouteFilter:
+    """Decides per request whether to continue or abort it.
+
+    Playlists are never blocked. The first HLS segment is let through (it proves
+    playback started), later ones are aborted.
+    """
+
+    def __init__(self, block_resource_types=None, block_domains=None, block_extensions=None,
+                 allow_domains=None, max_segments=1):
+        self.block_resource_types = set(
+            config.BLOCK_RESOURCE_TYPES if block_resource_types is None else block_resource_types)
+        self.block_domains = list(config.BLOCK_DOMAINS if block_domains is None else block_domains)
+        self.block_extensions = tuple(
+            config.BLOCK_EXTENSIONS if block_extensions is None else block_extensions)
+        self.allow_domains = list(allow_domains or [])
+        self.max_segments = max_segments
+        self.segments_seen = 0
+        self.blocked = {}
+
+    @classmethod
+    def for_stream(cls, stream_config):
+        """Filter for a stream, or None if routing is turned off.
+
+        A stream may set 'route_filter' to False, or to a dict of constructor
+        arguments to override the default lists.
+        """
+        options = stream_config.get('route_filter', {})
+        if not config.ROUTE_FILTER or options is False:
+            return None
+        return cls(**(options if isinstance(options, dict) else {}))
+
+    def reason_to_block(self, url, resource_type):
+        """Return why a request should be aborted, or None to let it through"""
+        if is_playlist(url):
+            return None
+        parsed = urlparse(url)
+        host = (parsed.hostname or '').lower()
+        if matches_domain(host, self.allow_domains):
+            return None
+        if is_segment(url):
+            self.segments_seen += 1
+            return 'segment' if self.segments_seen > self.max_segments else None
+        if matches_domain(host, self.block_domains):
+            return 'domain'
+        if resource_type in self.block_resource_types:
+            return 'resource_type'
+        if parsed.path.lower().endswith(self.block_extensions):
+            return 'extension'
+        return None
+
+    async def handle(self, route):
+        request = route.request
+        reason = self.reason_to_block(request.url, request.resource_type)
+        try:
+            if reason:
+                self.blocked[reason] = self.blocked.get(reason, 0) + 1
+                await route.abort('blockedbyclient')
+            else:
+                await route.continue_()
+        except Exception:
+            # The page or context closed while the request was in flight
+            pass
+
+    async def install(self, context):
+        """Route every request of a browser context (all pages and frames) through the filter"""
+        await context.route('**/*', self.handle)
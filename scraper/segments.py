@@ -0,0 +1,118 @@
+"""
+Segment resolver - rebuilds the playlist URL from captured .ts/.m4s segment requests
+"""
+import posixpath
+import re
+from urllib.parse import urlparse, urlunparse
+
+from . import config
+from .capture import is_playlist
+from .hls import PlaylistFetcher
+from .metrics import metrics
+
+# Playlist names packagers put next to their segments
+SIBLING_NAMES = ('index.m3u8', 'playlist.m3u8', 'chunklist.m3u8', 'master.m3u8', 'mono.m3u8',
+                 'stream.m3u8', 'prog_index.m3u8', 'live.m3u8')
+# stem + sequence number + optional track suffix: segment-5-v1-a1.ts, media_b800000_123.ts,
+# 720p_00012.ts, stream1-12345.ts, 00012.ts
+SEGMENT_NAME = re.compile(r'^(?P<stem>.*?)[-_.]?(?P<number>\d+)(?P<suffix>(?:[-_][a-z]+\d+)*)\.[a-z0-9]+$',
+                          re.IGNORECASE)
+
+
+def _with_path(url, path):
+    return urlunparse(urlparse(url)._replace(path=path))
+
+
+def _without_query(url):
+    return urlunparse(urlparse(url)._replace(query='', fragment=''))
+
+
+def playlist_guesses(segment_url):
+    """Likely playlist URLs for a segment, most specific first.
+
+    Names derived from the segment file name come first (Wowza chunklist_*,
+    Akamai/Kaltura index-v1-a1, stem.m3u8), then the usual names in the same
+    directory, then the directory itself as a playlist and the usual names one
+    level up for variant directories. Each guess keeps the segment's query
+    string (tokens are often path-wide) and is repeated without it.
+    """
+    path = urlparse(segment_url).path
+    directory, name = posixpath.split(path)
+    names = []
+    match = SEGMENT_NAME.match(name)
+    if match:
+        stem, suffix = match.group('stem'), match.group('suffix')
+        if stem.lower().startswith('media'):
+            names.append('chunklist' + stem[5:] + suffix + '.m3u8')
+        if suffix:
+            names.append('index' + suffix + '.m3u8')
+        if stem and stem.lower() not in ('segment', 'seg', 'chunk', 'media'):
+            names.append(stem + suffix + '.m3u8')
+    names.extend(SIBLING_NAMES)
+
+    paths = [posixpath.join(directory, n) for n in names]
+    parent, leaf = posixpath.split(directory)
+    if leaf:
+        paths.append(directory + '.m3u8')
+        paths.extend(posixpath.join(parent, n) for n in ('master.m3u8', 'index.m3u8', 'playlist.m3u8'))
+
+    guesses = []
+    for p in paths:
+        for url in (_with_path(segment_url, p), _without_query(_with_path(segment_url, p))):
+            if url not in guesses:
+                guesses.append(url)
+    return guesses
+
+
+def _directory(url):
+    return posixpath.dirname(urlparse(url).path)
+
+
+def confirms(playlist, segment_dirs, fetcher, headers):
+    """True if the playlist (or, for a master, one of its variants) serves segments from
+    a directory the captured segments came from. Live windows move on, so the directory
+    is compared rather than the exact segment names."""
+    if not playlist.is_master:
+        return any(_directory(s) in segment_dirs for s in playlist.segments)
+    # Variants living next to the segments are checked first
+    variants = sorted(playlist.variants, key=lambda v: _directory(v.uri) not in segment_dirs)
+    for variant in variants[:3]:
+        media = fetcher.fetch(variant.uri, headers)
+        metrics.count('segment_probes')
+        if media and not media.is_master and any(_directory(s) in segment_dirs for s in media.segments):
+            return True
+    return False
+
+
+def resolve_playlist(segments, hints=(), fetcher=None, max_probes=config.SEGMENT_RESOLVE_PROBES):
+    """Find the playlist behind captured segments.
+
+    `segments` are (url, headers) pairs, newest first; `hints` are URLs seen
+    with segment requests over CDP (pre-redirect URLs and initiators). Playlist
+    hints are tried as they are, other hints are treated like segment URLs so a
+    redirect to another host does not hide the original layout. Every guess is
+    fetched and parsed, and only a playlist that serves the captured segments
+    is accepted. Blocking; returns (link, headers) or None.
+    """
+    if not segments:
+        return None
+    fetcher = fetcher or PlaylistFetcher()
+    headers = segments[0][1]
+    segment_urls = [url for url, _ in segments] + [h for h in hints if not is_playlist(h)]
+    segment_dirs = {_directory(url) for url in segment_urls}
+
+    candidates = [h for h in hints if is_playlist(h)]
+    seen_dirs = set()
+    for url in segment_urls:
+        directory = (urlparse(url).netloc, _directory(url))
+        if directory in seen_dirs:
+            continue
+        seen_dirs.add(directory)
+        candidates.extend(g for g in playlist_guesses(url) if g not in candidates)
+
+    for link in candidates[:max_probes]:
+        playlist = fetcher.fetch(link, headers)
+        metrics.count('segment_probes')
+        if playlist and confirms(playlist, segment_dirs, fetcher, headers):
+            return link, headers
+    return None
@@ -0,0 +1,113 @@
+"""
+Browserless fast path - finds the playlist in page HTML/JS and follows iframe chains
+"""
+import base64
+import binascii
+import re
+from collections import deque
+from urllib.parse import urljoin
+
+import requests
+
+from . import config
+from .probe import probe_playlist
+from .results import implied_headers
+from .routing import is_blocked_domain
+
+IFRAME_SRC = re.compile(r'<iframe[^>]+?src\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+PLAYLIST_URL = re.compile(r'https?://[^\s"\'<>\\]+?\.m3u8[^\s"\'<>\\]*', re.IGNORECASE)
+# Player configs: source: "...", file: '...', hls = "..." (may be relative)
+PLAYER_FIELD = re.compile(
+    r'(?:source|file|src|hls|url|stream)\s*[:=]\s*["\']([^"\']+?\.m3u8[^"\']*)["\']', re.IGNORECASE)
+# atob("aHR0cHM6Ly8...") and bare base64 strings long enough to hold a URL
+BASE64_STRING = re.compile(r'["\']([A-Za-z0-9+/]{24,}={0,2})["\']')
+# "https://host" + "/hls/" + "name.m3u8"
+CONCATENATION = re.compile(r'(?:["\'][^"\'\n]*["\']\s*\+\s*)+["\'][^"\'\n]*["\']')
+STRING_LITERAL = re.compile(r'["\']([^"\'\n]*)["\']')
+
+
+def _decode_base64(value):
+    try:
+        decoded = base64.b64decode(value + '=' * (-len(value) % 4)).decode('utf-8')
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return ''
+    return decoded if decoded.isprintable() else ''
+
+
+def find_playlists(text, base_url):
+    """Playlist URLs in HTML/JS, in the order the patterns find them"""
+    text = text.replace('\\/', '/')
+    found = []
+
+    def add(url):
+        url = urljoin(base_url, url.strip())
+        if url.startswith('http') and url not in found:
+            found.append(url)
+
+    for match in PLAYLIST_URL.finditer(text):
+        add(match.group(0))
+    for match in PLAYER_FIELD.finditer(text):
+        add(match.group(1))
+    for match in CONCATENATION.finditer(text):
+        if 'm3u8' in match.group(0).lower():
+            joined = ''.join(STRING_LITERAL.findall(match.group(0)))
+            for url in PLAYLIST_URL.findall(joined) or [joined]:
+                if '.m3u8' in url.lower():
+                    add(url)
+    for match in BASE64_STRING.finditer(text):
+        decoded = _decode_base64(match.group(1))
+        for url in PLAYLIST_URL.findall(decoded):
+            add(url)
+    return found
+
+
+def find_iframes(text, base_url):
+    """iframe URLs on a page, skipping blank frames and ad domains"""
+    frames = []
+    for src in IFRAME_SRC.findall(text):
+        url = urljoin(base_url, src.strip())
+        if not url.startswith('http') or is_blocked_domain(url):
+            continue
+        frames.append(url)
+    return frames
+
+
+def extract_static(stream_config, max_depth=config.STATIC_MAX_DEPTH,
+                   timeout=config.STATIC_TIMEOUT, session=None, verify=True):
+    """Find a playlist without a browser.
+
+    Fetches the source page and follows iframe chains breadth-first up to
+    max_depth. Each page is fetched with the Referer of its parent, the way the
+    browser would. Candidates are checked with the liveness probe unless
+    verify is False. Returns {'link', 'headers', 'frame', 'depth'} or None.
+    """
+    http = session or requests.Session()
+    queue = deque([(stream_config['url'], None, 0)])
+    visited = set()
+
+    while queue:
+        url, referer, depth = queue.popleft()
+        if url in visited:
+            continue
+        visited.add(url)
+
+        headers = {'User-Agent': config.USER_AGENT}
+        if referer:
+            headers['Referer'] = referer
+        try:
+            response = http.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            continue
+        if response.status_code != 200:
+            continue
+
+        for link in find_playlists(response.text, response.url):
+            headers = implied_headers(response.url)
+            if not verify or probe_playlist(link, headers, timeout=timeout, session=http)['ok']:
+                return {'link': link, 'headers': headers, 'frame': response.url, 'depth': depth}
+
+        if depth < max_depth:
+            for frame in find_iframes(response.text, response.url):
+                queue.append((frame, response.url, depth + 1))
+
+    return None
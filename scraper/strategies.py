@@ -0,0 +1,271 @@
+"""
+Capture strategies - the listener, CDP, aggressive and ultimate approaches of the old scripts
+"""
+import asyncio
+import base64
+from collections import OrderedDict
+
+from . import config
+from .capture import is_playlist, is_playlist_type, is_segment
+from .interaction import interact_ranked
+from .log import log
+from .results import pick_headers
+
+# Play every video and click everything that looks like a play control
+FORCE_PLAY_SCRIPT = """
+    () => {
+        document.querySelectorAll('video').forEach(v => {
+            v.muted = true;
+            v.play().catch(() => {});
+            try { v.click(); } catch(e) {}
+        });
+        document.querySelectorAll('button, [role="button"], [class*="play"], [id*="play"]').forEach(el => {
+            try { el.click(); } catch(e) {}
+        });
+    }
+"""
+
+
+# Response bodies Chromium keeps for Network.getResponseBody, per resource and in total
+CDP_BUFFERS = {'maxResourceBufferSize': 2 * 2 ** 20, 'maxTotalBufferSize': 16 * 2 ** 20}
+# Requests whose headers are remembered until their response arrives
+CDP_TRACKED_REQUESTS = 500
+
+# Body reads in flight; the loop only keeps weak references to tasks
+_tasks = set()
+
+
+def _spawn(coroutine):
+    task = asyncio.ensure_future(coroutine)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+class Strategy:
+    """A way of provoking and capturing playlist requests.
+
+    attach() runs before navigation, interact() runs if nothing was captured
+    within `initial_wait`, then the runner waits up to `timeout` for a playlist.
+    """
+
+    name = None
+    initial_wait = config.INITIAL_WAIT
+    timeout = config.CAPTURE_TIMEOUT
+
+    async def attach(self, page, capture, stream_config):
+        pass
+
+    async def interact(self, page, capture, stream_config):
+        pass
+
+
+def on_request(capture, stream_config, count=True):
+    """Page 'request' listener adding playlists to capture; count=False leaves the request log alone"""
+    def handler(request):
+        url = request.url
+        if count:
+            capture.saw(url)
+        if is_playlist(url) and capture.add(url, pick_headers(request.headers)):
+            log(stream_config, f"✅ Found m3u8: {url[:80]}...")
+    return handler
+
+
+async def _read_body(capture, response):
+    try:
+        capture.set_body(response.url, await response.text())
+    except Exception:
+        # Page closed, redirect or body already evicted; the playlist is fetched later instead
+        pass
+
+
+def on_response(capture, stream_config, segments=False):
+    """Page 'response' listener; also matches HLS content types and, optionally, segments.
+
+    The body of each new playlist is read in the background and kept on its record.
+    """
+    def handler(response):
+        url = response.url
+        content_type = response.headers.get('content-type', '')
+        if is_playlist(url) or is_playlist_type(content_type):
+            if capture.add(url, pick_headers(response.request.headers)):
+                log(stream_config, f"✅ Found m3u8 (response): {url[:80]}...")
+                _spawn(_read_body(capture, response))
+        elif segments and is_segment(url):
+            if response.request.redirected_from:
+                capture.add_segment_hint(response.request.redirected_from.url)
+            capture.add_segment(url, pick_headers(response.request.headers))
+    return handler
+
+
+async def force_play(frames):
+    """Run FORCE_PLAY_SCRIPT in all frames at once"""
+    async def run(frame):
+        try:
+            await frame.evaluate(FORCE_PLAY_SCRIPT)
+        except Exception:
+            pass
+    await asyncio.gather(*(run(frame) for frame in frames))
+
+
+class ListenerStrategy(Strategy):
+    """Request/response listeners and one click on the play control of the best-ranked frame"""
+
+    name = 'listener'
+
+    async def attach(self, page, capture, stream_config):
+        page.on('request', on_request(capture, stream_config))
+        page.on('response', on_response(capture, stream_config))
+
+    async def interact(self, page, capture, stream_config):
+        await interact_ranked(page, capture, stream_config, top=1)
+
+
+class CdpNetwork:
+    """Network domain listener on one CDP session (the page or an out-of-process iframe).
+
+    Playlists are recognised by URL when requested and by MIME type when the
+    response arrives; on loadingFinished their body is read with
+    Network.getResponseBody. Segment responses are recorded too.
+    """
+
+    def __init__(self, session, capture, stream_config):
+        self.session = session
+        self.capture = capture
+        self.stream_config = stream_config
+        self.requests = OrderedDict()
+        self.playlists = {}
+
+    async def start(self):
+        self.session.on('Network.requestWillBeSent', self.on_request)
+        self.session.on('Network.responseReceived', self.on_response)
+        self.session.on('Network.loadingFinished', self.on_finished)
+        await self.session.send('Network.enable', CDP_BUFFERS)
+        return self
+
+    def on_request(self, params):
+        request = params.get('request', {})
+        url = request.get('url', '')
+        headers = pick_headers(request.get('headers', {}))
+        self.capture.saw(url)
+        self.requests[params['requestId']] = headers
+        if len(self.requests) > CDP_TRACKED_REQUESTS:
+            self.requests.popitem(last=False)
+        if is_segment(url):
+            # The URL before a redirect keeps the packager's layout; the initiator may be the playlist
+            if 'redirectResponse' in params:
+                self.capture.add_segment_hint(params['redirectResponse'].get('url', ''))
+            initiator = params.get('initiator', {}).get('url', '')
+            if is_playlist(initiator):
+                self.capture.add_segment_hint(initiator)
+        if is_playlist(url) and self.capture.add(url, headers):
+            log(self.stream_config, f"✅ CDP captured m3u8: {url[:80]}...")
+
+    def on_response(self, params):
+        response = params.get('response', {})
+        url = response.get('url', '')
+        mime_type = response.get('mimeType', '')
+        headers = self.requests.pop(params['requestId'], None) or pick_headers(response.get('requestHeaders', {}))
+        if is_playlist(url) or is_playlist_type(mime_type):
+            if self.capture.add(url, headers):
+                log(self.stream_config, f"✅ CDP captured m3u8 ({mime_type}): {url[:80]}...")
+            self.playlists[params['requestId']] = url
+        elif is_segment(url) or mime_type == 'video/mp2t':
+            self.capture.add_segment(url, headers)
+
+    def on_finished(self, params):
+        url = self.playlists.pop(params['requestId'], None)
+        if url:
+            _spawn(self.read_body(params['requestId'], url))
+
+    async def read_body(self, request_id, url):
+        try:
+            result = await self.session.send('Network.getResponseBody', {'requestId': request_id})
+        except Exception:
+            return
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', 'replace')
+        self.capture.set_body(url, body)
+
+
+class CdpStrategy(Strategy):
+    """CDP Network capture on the page and every out-of-process iframe, then force play.
+
+    Sessions are opened before navigation. Iframes that Chromium runs in their
+    own process get a session when they navigate. Dedicated workers, service
+    workers and popups are not reachable from a page session, so their traffic
+    is taken from the context's request/response events instead.
+    """
+
+    name = 'cdp'
+    initial_wait = 10
+    timeout = 30
+
+    async def attach(self, page, capture, stream_config):
+        await CdpNetwork(await page.context.new_cdp_session(page), capture, stream_config).start()
+
+        attached = {page.main_frame}
+
+        async def attach_frame(frame):
+            if frame in attached:
+                return
+            try:
+                session = await page.context.new_cdp_session(frame)
+            except Exception:
+                # Same-process frame: already covered by its parent's session
+                return
+            attached.add(frame)
+            try:
+                await CdpNetwork(session, capture, stream_config).start()
+            except Exception:
+                pass
+
+        page.on('framenavigated', lambda frame: _spawn(attach_frame(frame)))
+        page.context.on('request', on_request(capture, stream_config, count=False))
+        page.context.on('response', on_response(capture, stream_config))
+
+    async def interact(self, page, capture, stream_config):
+        try:
+            await page.evaluate(FORCE_PLAY_SCRIPT)
+            log(stream_config, "Triggered play actions")
+        except Exception as e:
+            log(stream_config, f"Play trigger error: {e}")
+
+
+class AggressiveStrategy(ListenerStrategy):
+    """Play the best-ranked frames concurrently, then force play with JavaScript everywhere"""
+
+    name = 'aggressive'
+    initial_wait = 10
+    timeout = 45
+
+    async def interact(self, page, capture, stream_config):
+        await interact_ranked(page, capture, stream_config)
+        if not capture.found:
+            await force_play(page.frames)
+
+
+class UltimateStrategy(Strategy):
+    """Listen to everything, including HLS content types and .ts segments"""
+
+    name = 'ultimate'
+    initial_wait = 10
+    timeout = 60
+
+    async def attach(self, page, capture, stream_config):
+        page.on('request', on_request(capture, stream_config))
+        page.on('response', on_response(capture, stream_config, segments=True))
+
+    async def interact(self, page, capture, stream_config):
+        await force_play(page.frames)
+
+
+STRATEGIES = {s.name: s for s in (ListenerStrategy, CdpStrategy, AggressiveStrategy, UltimateStrategy)}
+
+
+def get_strategies(names):
+    """Instantiate strategies by name, cheapest first as given"""
+    unknown = [n for n in names if n not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {', '.join(unknown)}")
+    return [STRATEGIES[n]() for n in names]